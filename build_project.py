@@ -1,35 +1,102 @@
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from platform import system
+
 from cx_Freeze import setup, Executable
 
 from work_clock import APP_NAME_CODE, APP_NAME, APP_VERSION, APP_DESCRIPTION, VERSION_FILE_PATH
 
 
-def build_app():
+BUILD_PROFILES = ('default', 'slim')
+STARTUP_RUNS = 5
+
+DEFAULT_EXCLUDES = [
+    'unittest', 'pytest',
+    'cx_Freeze', 'setuptools', 'distutils',
+    'ctypes', 'lib2to3',
+]
+
+# Modules that are never used by the app. The bindings for Safari, IE and WebKit can not be
+# dropped, because `selenium.webdriver` imports them eagerly, but the Chrome DevTools Protocol
+# (one package per browser version) and its websocket stack are only loaded on demand.
+SLIM_EXCLUDES = [
+    'selenium.webdriver.common.devtools',
+    'selenium.webdriver.common.bidi.cdp',
+    'trio', 'trio_websocket', 'wsproto',
+]
+
+# Selenium Manager binaries, only the one for the build platform is needed
+SELENIUM_MANAGER_PLATFORMS = {'Windows': 'windows', 'Linux': 'linux', 'Darwin': 'macos'}
+
+
+def build_options(profile: str, build_dir: str) -> dict:
+    options = {
+        "build_exe": build_dir,
+        "include_files": [VERSION_FILE_PATH],
+        "packages": ['requests', 'selenium'],
+        "excludes": list(DEFAULT_EXCLUDES),
+        "optimize": 2,
+    }
+    if profile == 'slim':
+        foreign_managers = [
+            f'selenium.webdriver.common.{platform}'
+            for name, platform in SELENIUM_MANAGER_PLATFORMS.items() if name != system()
+        ]
+        # let the import scan pick the needed selenium modules instead of the whole package
+        options["packages"] = ['requests']
+        options["excludes"] += SLIM_EXCLUDES + foreign_managers
+        # precompiled modules are read from one archive, except for selenium, which loads its
+        # JavaScript snippets and the Selenium Manager binary from paths next to its modules
+        options["zip_include_packages"] = ['*']
+        options["zip_exclude_packages"] = ['selenium']
+    return options
+
+
+def measure_startup(build_dir: str, profile: str) -> dict:
+    executable = Path(build_dir).joinpath(APP_NAME_CODE + ('.exe' if system() == 'Windows' else ''))
+    durations = []
+    for _ in range(STARTUP_RUNS):
+        start = time.perf_counter()
+        subprocess.run([executable, '--startup-check'], check=True)
+        durations.append(time.perf_counter() - start)
+    measurement = {
+        'version': APP_VERSION,
+        'profile': profile,
+        'platform': system(),
+        'runs': STARTUP_RUNS,
+        'first_seconds': round(durations[0], 3),
+        'median_seconds': round(statistics.median(durations), 3),
+        'min_seconds': round(min(durations), 3),
+    }
+    with open(Path(build_dir).joinpath('startup_time.json'), 'w', encoding='utf-8') as measurement_file:
+        measurement_file.write(json.dumps(measurement, indent=2))
+    return measurement
+
+
+def build_app(profile: str) -> str:
     app = Executable(
         script="work_clock/__main__.py",
         target_name=APP_NAME_CODE,
-        base="Win32GUI",
+        base="Win32GUI" if system() == 'Windows' else None,
     )
 
     with open(VERSION_FILE_PATH, 'w') as version_file:
         version_file.write(APP_VERSION)
 
-    build_exe_options = {
-        "build_exe": f"build/{APP_NAME_CODE}_v{APP_VERSION}",
-        "include_files": [VERSION_FILE_PATH],
-        "packages": ['requests', 'selenium'],
-        "excludes": [
-            'unittest', 'pytest',
-            'cx_Freeze', 'setuptools', 'distutils',
-            'ctypes', 'lib2to3', 'html',
-        ],
-        "optimize": 2,
-    }
+    build_dir = f"build/{APP_NAME_CODE}_v{APP_VERSION}"
+    if profile != 'default':
+        build_dir += f"_{profile}"
 
     # the git tag based version number might have a form like `0.1.2-15-g45c54ca-dirty`,
     # which does not follow PEP 440 and thus needs to be cleaned
     split_version_number = APP_VERSION.split('-')
     cleaned_version_number = split_version_number[0]
-    if len(split_version_number) > 1:
+    if len(split_version_number) > 1 and split_version_number[1].isdigit():
         cleaned_version_number += f'.dev{split_version_number[1]}'
 
     setup(
@@ -37,11 +104,24 @@ def build_app():
         version=cleaned_version_number,
         description=APP_DESCRIPTION,
         executables=[app],
-        options={'build_exe': build_exe_options}
+        options={'build_exe': build_options(profile, build_dir)}
     )
+    return build_dir
 
 
 if __name__ == '__main__':
-    print(f"Building {APP_NAME} {APP_VERSION}")
-    build_app()
+    PARSER = argparse.ArgumentParser()
+    PARSER.add_argument('--profile', choices=BUILD_PROFILES, default='default')
+    PARSER.add_argument('--no-startup-measurement', action='store_true')
+    ARGS, SETUP_ARGS = PARSER.parse_known_args()
+    # the remaining arguments, e.g. `build`, are meant for cx_Freeze
+    sys.argv = sys.argv[:1] + SETUP_ARGS
+
+    print(f"Building {APP_NAME} {APP_VERSION} ({ARGS.profile} profile)")
+    BUILD_DIR = build_app(ARGS.profile)
     print(f"Done: Building {APP_NAME} {APP_VERSION}")
+
+    if not ARGS.no_startup_measurement and {'build', 'build_exe'} & set(SETUP_ARGS):
+        MEASUREMENT = measure_startup(BUILD_DIR, ARGS.profile)
+        print(f"Startup time: {MEASUREMENT['median_seconds']} s median of {MEASUREMENT['runs']} runs, "
+              f"{MEASUREMENT['first_seconds']} s for the first run")
@@ -0,0 +1,29 @@
+import random
+import timeit
+
+from work_clock.time_evaluation import BookingTime, TimeBookingList, DailyBookings, normalize_bookings
+
+
+def random_punches(count: int, generator: random.Random) -> TimeBookingList:
+    bookings = []
+    for _ in range(count):
+        start = generator.randint(0, 23 * 60)
+        bookings.append((BookingTime(0, start), BookingTime(0, start + generator.randint(1, 60))))
+    return bookings
+
+
+def run_benchmark() -> None:
+    generator = random.Random(4711)
+    print(f"{'punches':>10} {'normalize [ms]':>15} {'total raw [ms]':>15} {'total normalized [ms]':>22}")
+    for count in (10, 1_000, 10_000, 100_000, 1_000_000):
+        bookings = random_punches(count, generator)
+        repeat = max(1, 10_000 // count)
+        normalize_time = timeit.timeit(lambda: normalize_bookings(bookings), number=repeat) / repeat
+        raw_time = timeit.timeit(lambda: DailyBookings(bookings).total, number=repeat) / repeat
+        normalized = normalize_bookings(bookings)
+        normalized_time = timeit.timeit(lambda: DailyBookings(normalized).total, number=repeat) / repeat
+        print(f"{count:>10} {normalize_time * 1e3:>15.3f} {raw_time * 1e3:>15.3f} {normalized_time * 1e3:>22.3f}")
+
+
+if __name__ == '__main__':
+    run_benchmark()
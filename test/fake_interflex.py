@@ -0,0 +1,106 @@
+import datetime
+from pathlib import Path
+from string import Template
+from typing import Optional
+
+from selenium.common import WebDriverException
+from selenium.webdriver.common.by import By
+
+from fake_webdriver import FakeElement, FakeWebDriver
+from work_clock.browser_processes import BrowserProcesses
+from work_clock.cache import JsonCache
+from work_clock.driver_cache import DriverCache
+from work_clock.interflex_requests import SeleniumTimeBooker, LOGIN_URL
+from work_clock.launch_stats import LaunchStats
+from work_clock.navigation import NavigationCache, NavigationUrls
+from work_clock.resilience import RetryPolicy
+from work_clock.saldo_cache import SaldoCache
+from work_clock.session_store import SessionStore
+from work_clock.settings import SETTINGS
+
+
+FIXTURES = Path(__file__).parent.joinpath('fixtures', 'interflex')
+# a different profile than the default one, which has to be discovered after the login
+URLS = NavigationUrls(SETTINGS.base_url, 'iflx/profile_4711/')
+MAIN_URL, HOME_URL, MENUE_URL, BOOKING_URL = URLS.main, URLS.home, URLS.menue, URLS.booking
+OPEN_ROW = ('<tr><td class="iflxQujouTab2" colspan="2"></td><td class="iflxQujouTabTime2">15:00</td>'
+            '<td class="iflxQujouTabTime2"></td><td class="iflxQujouTabAccount2"></td></tr>')
+
+
+class FakeInterflex:
+    def __init__(self, clocked_in: bool = True):
+        self.clocked_in = clocked_in
+        self.logged_in = False
+        self.failing_urls: set[str] = set()
+        self.fetched: list[str] = []  # pages fetched by the parallel fetch script
+        self.script_error: Optional[str] = None
+
+    def render(self, url: str) -> str:
+        if url in self.failing_urls:
+            raise WebDriverException(f"Timed out loading {url}")
+        page = url.rsplit('/', 1)[-1].removesuffix('.jsp')
+        if not self.logged_in or (page != 'pin' and not url.startswith(URLS.base_url + URLS.profile_path)):
+            page = 'pin'
+        today = datetime.date.today()
+        return Template(FIXTURES.joinpath(f'{page}.html').read_text(encoding='utf-8')).substitute(
+            today=today.strftime('%d.%m.%Y'),
+            yesterday=(today - datetime.timedelta(days=1)).strftime('%d.%m.%Y'),
+            button='Gehen' if self.clocked_in else 'Kommen',
+            open_row=OPEN_ROW if self.clocked_in else '',
+        )
+
+    def on_click(self, driver: FakeWebDriver, element: FakeElement) -> None:
+        if 'iflxButtonFactoryTextContainerOuter' in element.classes:
+            self.logged_in = True
+            driver.cookies.append({'name': 'JSESSIONID', 'value': 'session-of-the-pin-login'})
+            driver.show(MAIN_URL)
+        elif 'iflxButtonFactoryTextContainerNormal' in element.classes:
+            self.clocked_in = not self.clocked_in
+            driver.show(BOOKING_URL)
+        elif 'iflxMenu3ExitButton' in element.classes:
+            self.logged_in = False
+            driver.show(LOGIN_URL)
+
+    def fetch_status(self, _script: str, booking_url: str, main_url: str, home_url: Optional[str],
+                     selectors: dict[str, str]) -> dict:
+        # the result of PARALLEL_FETCH_SCRIPT, read from the pages like the script does in the browser
+        if self.script_error is not None:
+            return {'error': self.script_error}
+
+        def fetch(url: str) -> FakeWebDriver:
+            self.fetched.append(url)
+            page = FakeWebDriver(self.render)
+            page.show(url)
+            return page
+
+        def texts(page: Optional[FakeWebDriver], selector: str) -> list[str]:
+            if page is None:
+                return []
+            return [element.text for element in page.find_elements(By.CSS_SELECTOR, selector)]
+
+        fetch(booking_url)
+        fetch(main_url)
+        home = fetch(home_url) if home_url else None
+        booking = fetch(booking_url)
+        buttons = booking.find_elements(By.CLASS_NAME, selectors['button'])
+        return {
+            'saldo_headers': texts(home, selectors['saldo_headers']),
+            'saldo_cells': texts(home, selectors['saldo_cells']),
+            'journal_headers': texts(booking, selectors['journal_headers']),
+            'journal_cells': [[cell.text, cell.get_attribute('colspan')]
+                              for cell in booking.find_elements(By.CSS_SELECTOR, selectors['journal_cells'])],
+            'button': buttons[0].text if buttons else None,
+        }
+
+
+def make_booker(directory: Path) -> SeleniumTimeBooker:
+    # a booker that keeps all of its caches in the given directory instead of the config directory
+    booker = SeleniumTimeBooker(employee_id=1234, employee_pin=5678,
+                                retry_policy=RetryPolicy(max_attempts=2, base_delay=0.0))
+    booker._processes = BrowserProcesses(JsonCache('browser_processes.json', directory=directory))
+    booker._driver_cache = DriverCache(JsonCache('driver_cache.json', directory=directory))
+    booker._launch_stats = LaunchStats(JsonCache('launch_latencies.json', directory=directory))
+    booker._saldo_cache = SaldoCache(JsonCache('saldo_cache.json', directory=directory))
+    booker._navigation_cache = NavigationCache(JsonCache('navigation.json', directory=directory))
+    booker._session_store = SessionStore(JsonCache('session.json', directory=directory))
+    return booker
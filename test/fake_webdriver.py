@@ -0,0 +1,166 @@
+import re
+from collections import Counter
+from html.parser import HTMLParser
+from typing import Any, Callable, Iterator, Optional
+
+from selenium.common import NoSuchElementException, WebDriverException
+from selenium.webdriver.common.by import By
+
+
+VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'wbr'}
+SIMPLE_SELECTOR = re.compile(r'^(?P<tag>[a-zA-Z0-9]*)(?P<rest>(?:[.#][\w-]+)*)$')
+
+
+class FakeElement:
+    def __init__(self, driver: 'FakeWebDriver', tag_name: str, attributes: dict[str, Optional[str]]):
+        self._driver = driver
+        self.tag_name = tag_name
+        self.attributes = attributes
+        self.children: list['FakeElement'] = []
+        self.texts: list[str] = []  # own text and the text of the children, in document order
+        self.typed = ''
+
+    @property
+    def text(self) -> str:
+        self._driver.calls['text'] += 1
+        return ' '.join(''.join(self.texts).split())
+
+    def get_attribute(self, name: str) -> Optional[str]:
+        self._driver.calls['get_attribute'] += 1
+        return self.attributes.get(name)
+
+    def send_keys(self, value: str) -> None:
+        self._driver.calls['send_keys'] += 1
+        self.typed += value
+
+    def click(self) -> None:
+        self._driver.calls['click'] += 1
+        self._driver.clicked.append(self)
+        self._driver.on_click(self._driver, self)
+
+    @property
+    def classes(self) -> list[str]:
+        return (self.attributes.get('class') or '').split()
+
+    def iter(self) -> Iterator['FakeElement']:
+        for child in self.children:
+            yield child
+            yield from child.iter()
+
+    def matches(self, selector: str) -> bool:
+        match = SIMPLE_SELECTOR.match(selector.strip())
+        if match is None:
+            raise NotImplementedError(f"Selector '{selector}' is not supported by the fake driver")
+        if match['tag'] and match['tag'] != self.tag_name:
+            return False
+        for part in re.findall(r'[.#][\w-]+', match['rest']):
+            if part[0] == '.' and part[1:] not in self.classes:
+                return False
+            if part[0] == '#' and part[1:] != self.attributes.get('id'):
+                return False
+        return True
+
+
+class _DocumentParser(HTMLParser):
+    def __init__(self, driver: 'FakeWebDriver'):
+        super().__init__()
+        self.root = FakeElement(driver, 'document', {})
+        self._driver = driver
+        self._open = [self.root]
+
+    def handle_starttag(self, tag, attrs):
+        element = FakeElement(self._driver, tag, dict(attrs))
+        self._open[-1].children.append(element)
+        if tag not in VOID_TAGS:
+            self._open.append(element)
+
+    def handle_endtag(self, tag):
+        for index in range(len(self._open) - 1, 0, -1):
+            if self._open[index].tag_name == tag:
+                del self._open[index:]
+                return
+
+    def handle_data(self, data):
+        for element in self._open:
+            element.texts.append(data)
+
+
+class FakeWebDriver:
+    # in-process stand-in for the subset of the WebDriver API used by the booker,
+    # pages are rendered by a callback and every call is counted to catch extra round trips
+    def __init__(self,
+                 render: Callable[[str], str],
+                 on_click: Optional[Callable[['FakeWebDriver', FakeElement], None]] = None,
+                 on_script: Optional[Callable[..., Any]] = None,
+                 ) -> None:
+        self._render = render
+        self.on_click = on_click if on_click is not None else lambda driver, element: None
+        self.on_script = on_script
+        self.calls: Counter = Counter()
+        self.visited: list[str] = []
+        self.clicked: list[FakeElement] = []
+        self.cookies: list[dict] = []
+        self.current_url = ''
+        self.capabilities = {'browserName': 'fake', 'browserVersion': '1.0'}
+        self.quit_called = False
+        self._document = FakeElement(self, 'document', {})
+
+    def get(self, url: str) -> None:
+        self.calls['get'] += 1
+        self.visited.append(url)
+        self.show(url)
+
+    def show(self, url: str) -> None:
+        # e.g. for redirects after a click, which are no calls of the booker
+        self.current_url = url
+        parser = _DocumentParser(self)
+        parser.feed(self._render(url))
+        parser.close()
+        self._document = parser.root
+
+    def find_elements(self, by: str = By.ID, value: Optional[str] = None) -> list[FakeElement]:
+        self.calls['find_elements'] += 1
+        return self._find(by, value)
+
+    def find_element(self, by: str = By.ID, value: Optional[str] = None) -> FakeElement:
+        self.calls['find_element'] += 1
+        elements = self._find(by, value)
+        if not elements:
+            raise NoSuchElementException(f"No element for {by} = '{value}'")
+        return elements[0]
+
+    def _find(self, by: str, value: str) -> list[FakeElement]:
+        match by:
+            case By.ID:
+                selectors = [f'#{value}']
+            case By.CLASS_NAME:
+                selectors = [f'.{value}']
+            case By.TAG_NAME:
+                selectors = [value]
+            case By.CSS_SELECTOR:
+                selectors = value.split(',')
+            case _:
+                raise NotImplementedError(f"Locator '{by}' is not supported by the fake driver")
+        return [element for element in self._document.iter()
+                if any(element.matches(selector) for selector in selectors)]
+
+    def add_cookie(self, cookie: dict) -> None:
+        self.calls['add_cookie'] += 1
+        self.cookies.append(cookie)
+
+    def get_cookies(self) -> list[dict]:
+        self.calls['get_cookies'] += 1
+        return list(self.cookies)
+
+    def set_script_timeout(self, _timeout: float) -> None:
+        self.calls['set_script_timeout'] += 1
+
+    def execute_async_script(self, script: str, *args):
+        self.calls['execute_async_script'] += 1
+        if self.on_script is None:
+            raise WebDriverException("Scripts are not supported by the fake driver")
+        return self.on_script(script, *args)
+
+    def quit(self) -> None:
+        self.calls['quit'] += 1
+        self.quit_called = True
@@ -0,0 +1,70 @@
+import subprocess
+import sys
+
+import psutil
+
+from work_clock.browser_processes import BrowserProcesses
+from work_clock.cache import JsonCache
+
+
+class FakeService:
+    def __init__(self, process):
+        self.process = process
+
+
+class FakeDriver:
+    def __init__(self, process):
+        self.service = FakeService(process)
+
+
+def test_track_and_release(tmp_path):
+    cache = JsonCache('browser_processes.json', directory=tmp_path)
+    process = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'])
+    processes = BrowserProcesses(cache)
+    processes.track(FakeDriver(process))
+    assert str(process.pid) in next(iter(cache.load().values()))
+    assert processes.resident_memory() > 0
+    processes.release()
+    assert process.wait(timeout=5) is not None
+    assert cache.load() == {}
+
+
+def test_reap_orphans(tmp_path):
+    cache = JsonCache('browser_processes.json', directory=tmp_path)
+    process = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'])
+    finished_owner = subprocess.Popen([sys.executable, '-c', 'pass'])
+    finished_owner.wait()
+    cache.save({
+        str(finished_owner.pid): {str(process.pid): psutil.Process(process.pid).create_time()},
+    })
+    assert BrowserProcesses(cache).reap_orphans() == 1
+    assert process.wait(timeout=5) is not None
+    assert cache.load() == {}
+
+
+def test_no_service_process(tmp_path):
+    processes = BrowserProcesses(JsonCache('browser_processes.json', directory=tmp_path))
+    processes.track(object())
+    assert processes.resident_memory() == 0
+    processes.release()
+
+
+def test_release_keeps_other_sessions(tmp_path):
+    cache = JsonCache('browser_processes.json', directory=tmp_path)
+    first_process = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'])
+    second_process = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'])
+    first, second = BrowserProcesses(cache), BrowserProcesses(cache)
+    first.track(FakeDriver(first_process))
+    second.track(FakeDriver(second_process))
+    assert len(cache.load()) == 2
+
+    first.release()
+    assert first_process.wait(timeout=5) is not None
+    assert second_process.poll() is None
+    assert [str(second_process.pid)] == [pid for tracked in cache.load().values() for pid in tracked]
+    # sessions of this process are alive, so they are no orphans
+    assert BrowserProcesses(cache).reap_orphans() == 0
+
+    second.release()
+    assert second_process.wait(timeout=5) is not None
+    assert cache.load() == {}
@@ -0,0 +1,54 @@
+import subprocess
+import sys
+
+from work_clock import logic
+from work_clock.cli import format_table, run_command
+from work_clock.daemon_client import DaemonClient
+
+
+def test_format_table():
+    result = {
+        'vpn_connected': True,
+        'clocked_in': None,
+        'saldo': '-0:15',
+        'bookings': [('8:00', '12:00'), ('12:30', '16:00')],
+    }
+    assert format_table(result) == '\n'.join([
+        'vpn_connected  yes',
+        'clocked_in     ?',
+        'saldo          -0:15',
+        'bookings       8:00-12:00, 12:30-16:00',
+    ])
+    assert format_table({'bookings': []}) == 'bookings  -'
+
+
+def test_daemon_client_is_lightweight():
+    # polling a running daemon must not pay for importing the browser automation
+    code = ('import sys, work_clock.cli; from work_clock.daemon_client import DaemonClient, RemoteClockState; '
+            'print(sorted({"selenium", "psutil", "work_clock.logic"} & set(sys.modules)))')
+    output = subprocess.check_output([sys.executable, '-c', code], text=True)
+    assert output.strip() == '[]'
+
+
+class StubClockState:
+    calls: list[str] = []
+
+    def update_status(self, refresh_saldo=False):
+        self.calls.append('update')
+
+    def toggle_clock(self):
+        self.calls.append('toggle')
+
+    def as_dict(self):
+        return {'clocked_in': True}
+
+
+def test_toggle_without_daemon_refreshes_once(monkeypatch, capsys):
+    monkeypatch.setattr(DaemonClient, 'is_running', lambda self: False)
+    monkeypatch.setattr(logic, 'ClockState', StubClockState)
+    monkeypatch.setattr(StubClockState, 'calls', [])
+    assert run_command('toggle') == 0
+    assert StubClockState.calls == ['toggle', 'update']
+    assert run_command('status') == 0
+    assert StubClockState.calls == ['toggle', 'update', 'update']
+    assert 'clocked_in' in capsys.readouterr().out
@@ -0,0 +1,131 @@
+import stat
+import threading
+from platform import system
+
+import pytest
+import requests
+
+from work_clock.cache import JsonCache
+from work_clock.daemon import ClockDaemon
+from work_clock.daemon_client import DaemonClient, RemoteClockState, DAEMON_HOST
+from work_clock.daemon_token import DaemonToken
+
+
+class StubClockState:
+    def __init__(self):
+        self.updates = 0
+        self.saldo_refreshes = 0
+        self.forced_updates = 0
+        self.toggles = 0
+
+    def update_status(self, force=False, refresh_saldo=False):
+        self.updates += 1
+        self.saldo_refreshes += refresh_saldo
+        self.forced_updates += force
+
+    def toggle_clock(self):
+        self.toggles += 1
+
+    def close(self):
+        pass
+
+    def as_dict(self):
+        return {
+            'vpn_connected': True,
+            'clocked_in': self.toggles % 2 == 1,
+            'saldo': '1:30',
+            'time_today': '2:00',
+            'done_today': '16:00',
+            'last_check': str(self.updates),
+            'bookings': [('8:00', '10:00')],
+        }
+
+
+@pytest.fixture(name='token')
+def fixture_token(tmp_path):
+    return DaemonToken(JsonCache('daemon_token.json', directory=tmp_path, private=True))
+
+
+@pytest.fixture
+def daemon(token):
+    clock_daemon = ClockDaemon(port=0, refresh_interval=3600, token=token)
+    clock_daemon._clock = StubClockState()
+    thread = threading.Thread(target=clock_daemon.serve_forever, daemon=True)
+    thread.start()
+    yield clock_daemon
+    clock_daemon.shutdown()
+    thread.join()
+
+
+def test_daemon_status_and_toggle(daemon, token):
+    client = DaemonClient(port=daemon.port, token=token)
+    assert client.is_running()
+    remote_clock = RemoteClockState(client)
+    assert remote_clock.saldo == '1:30'
+    assert remote_clock.bookings == [('8:00', '10:00')]
+    remote_clock.toggle_clock()
+    assert remote_clock.clocked_in is True
+    assert daemon._clock.toggles == 1
+    remote_clock.update_status()
+    assert remote_clock.clocked_in is True
+    remote_clock.update_status(refresh_saldo=True)
+    assert daemon._clock.saldo_refreshes == 1
+    assert daemon._clock.forced_updates == 0
+    remote_clock.update_status(force=True)
+    remote_clock.update_status(force=True, refresh_saldo=True)
+    assert daemon._clock.forced_updates == 2
+    assert daemon._clock.saldo_refreshes == 2
+
+    # polling reads the status of the daemon without any refresh
+    updates = daemon._clock.updates
+    daemon._clock.toggles += 1
+    remote_clock.poll_status()
+    assert remote_clock.clocked_in is False
+    assert daemon._clock.updates == updates
+
+
+def test_daemon_not_running():
+    assert not DaemonClient(port=1).is_running()
+
+
+def test_daemon_rejects_foreign_requests(daemon, token, tmp_path):
+    url = f'http://{DAEMON_HOST}:{daemon.port}/toggle'
+    authorization = {'Authorization': f'Bearer {token.load()}'}
+    # a web page can send simple requests to localhost, but not read the token file
+    assert requests.post(url, timeout=5).status_code == 401
+    assert requests.post(url, headers={'Authorization': 'Bearer wrong'}, timeout=5).status_code == 401
+    assert requests.post(url, headers={**authorization, 'Origin': 'http://evil.example'},
+                         timeout=5).status_code == 403
+    assert daemon._clock.toggles == 0
+    assert requests.post(url, headers=authorization, timeout=5).status_code == 200
+    assert daemon._clock.toggles == 1
+
+    # e.g. a daemon of another user or an old token file, the caller has to work without the daemon
+    other_token = DaemonToken(JsonCache('other_token.json', directory=tmp_path, private=True))
+    other_client = DaemonClient(port=daemon.port, token=other_token)
+    assert not other_client.is_running()
+    other_token.create()
+    assert not other_client.is_running()
+    with pytest.raises(RuntimeError):
+        other_client.status()
+
+
+def test_daemon_token_file(token):
+    first = token.create()
+    assert token.load() == first
+    assert token.create() != first
+    if system() != 'Windows':
+        assert stat.S_IMODE(token._cache.file_path.stat().st_mode) == 0o600
+    token.clear()
+    assert token.load() is None
+
+
+def test_remote_changes_are_published(daemon, token):
+    remote_clock = RemoteClockState(DaemonClient(port=daemon.port, token=token))
+    events = []
+    remote_clock.subscribe(events.append)
+    # only the time of the check is new
+    remote_clock.update_status()
+    assert not events
+    remote_clock.toggle_clock()
+    assert events == [{'clocked_in': (False, True)}]
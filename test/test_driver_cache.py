@@ -0,0 +1,106 @@
+import pytest
+from selenium import webdriver
+from selenium.common import WebDriverException
+
+from fake_interflex import make_booker
+from work_clock.cache import JsonCache
+from work_clock.driver_cache import DriverCache, CachedDriver
+from work_clock.interflex_requests import DRIVER_CLASSES
+from work_clock.settings import DriverType
+
+
+def test_driver_cache_roundtrip(tmp_path):
+    driver_binary = tmp_path.joinpath('msedgedriver')
+    driver_binary.touch()
+    cache = DriverCache(JsonCache('driver_cache.json', directory=tmp_path))
+    assert cache.lookup(DriverType.edge) is None
+
+    cached = CachedDriver(driver_path=str(driver_binary), browser_path='/opt/edge', browser_version='130.0')
+    cache.store(DriverType.edge, cached)
+    assert cache.lookup(DriverType.edge) == cached
+    assert cache.lookup(DriverType.firefox) is None
+
+    cache.invalidate(DriverType.edge)
+    assert cache.lookup(DriverType.edge) is None
+
+
+def test_driver_cache_missing_binary(tmp_path):
+    cache = DriverCache(JsonCache('driver_cache.json', directory=tmp_path))
+    missing = CachedDriver(driver_path=str(tmp_path.joinpath('gone')), browser_path='', browser_version='131.0')
+    cache.store(DriverType.chrome, missing)
+    assert cache.lookup(DriverType.chrome) is None
+
+
+def test_json_cache_broken_file(tmp_path):
+    tmp_path.joinpath('broken.json').write_text('{not json')
+    assert JsonCache('broken.json', directory=tmp_path).load() == {}
+
+
+class StubService:
+    def __init__(self, executable_path=None):
+        self.path = executable_path if executable_path is not None else '/resolved/chromedriver'
+
+
+class StubDriver:
+    # stands in for webdriver.Chrome, started drivers are recorded with the binaries they used
+    started: list['StubDriver'] = []
+    failing_paths: set[str] = set()
+    browser_version = '131.0'
+
+    def __init__(self, options, service=None):
+        self.service = service if service is not None else StubService()
+        if self.service.path in self.failing_paths:
+            raise WebDriverException(f"Could not start {self.service.path}")
+        self.options = options
+        self.capabilities = {'browserName': 'chrome', 'browserVersion': self.browser_version}
+        self.started.append(self)
+
+
+@pytest.fixture(name='launch')
+def fixture_launch(monkeypatch, tmp_path):
+    monkeypatch.setitem(DRIVER_CLASSES, DriverType.chrome,
+                        (webdriver.ChromeOptions, StubService, StubDriver, '--headless'))
+    monkeypatch.setattr(StubDriver, 'started', [])
+    monkeypatch.setattr(StubDriver, 'failing_paths', set())
+    booker = make_booker(tmp_path)
+    binary = tmp_path.joinpath('chromedriver')
+    binary.touch()
+    return booker, str(binary)
+
+
+def test_launch_resolves_and_stores_the_binaries(launch):
+    booker, _ = launch
+    driver = booker._launch_driver(DriverType.chrome)
+    # without a cache entry, Selenium Manager resolves the binaries (no service given)
+    assert driver.service.path == '/resolved/chromedriver'
+    assert booker._driver_cache._cache.load()['chrome'] == {
+        'driver_path': '/resolved/chromedriver', 'browser_path': '', 'browser_version': '131.0'}
+
+
+def test_launch_uses_the_cached_binaries(launch):
+    booker, binary = launch
+    booker._driver_cache.store(DriverType.chrome, CachedDriver(binary, '/opt/chrome', '131.0'))
+    driver = booker._launch_driver(DriverType.chrome)
+    assert driver.service.path == binary
+    assert driver.options.binary_location == '/opt/chrome'
+    assert booker._driver_cache.lookup(DriverType.chrome) is not None
+
+
+def test_launch_invalidates_after_a_browser_update(launch):
+    booker, binary = launch
+    booker._driver_cache.store(DriverType.chrome, CachedDriver(binary, '', '130.0'))
+    driver = booker._launch_driver(DriverType.chrome)
+    # the running driver is still used, the next launch resolves the matching one
+    assert driver.service.path == binary
+    assert booker._driver_cache.lookup(DriverType.chrome) is None
+    assert booker._launch_driver(DriverType.chrome).service.path == '/resolved/chromedriver'
+
+
+def test_launch_falls_back_when_the_cached_binary_fails(launch):
+    booker, binary = launch
+    booker._driver_cache.store(DriverType.chrome, CachedDriver(binary, '', '131.0'))
+    StubDriver.failing_paths.add(binary)
+    driver = booker._launch_driver(DriverType.chrome)
+    assert driver.service.path == '/resolved/chromedriver'
+    assert len(StubDriver.started) == 1
+    assert booker._driver_cache._cache.load()['chrome']['driver_path'] == '/resolved/chromedriver'
@@ -0,0 +1,263 @@
+import time
+
+import pytest
+from selenium.common import InvalidCookieDomainException, WebDriverException
+
+from fake_interflex import FakeInterflex, make_booker, URLS, MAIN_URL, HOME_URL, MENUE_URL, BOOKING_URL
+from fake_webdriver import FakeWebDriver
+from work_clock.interflex_requests import SeleniumTimeBooker, LOGIN_URL
+from work_clock.navigation import NavigationUrls
+from work_clock.settings import SETTINGS, DriverType
+from work_clock.time_evaluation import BookingTime
+
+
+@pytest.fixture(name='interflex')
+def fixture_interflex(monkeypatch):
+    site = FakeInterflex()
+    driver = FakeWebDriver(site.render, site.on_click)
+    monkeypatch.setattr(SeleniumTimeBooker, '_launch_driver', lambda self, driver_type: driver)
+    return site, driver
+
+
+@pytest.fixture(name='booker')
+def fixture_booker(tmp_path):
+    return make_booker(tmp_path)
+
+
+def test_full_context_flow(interflex, booker):
+    site, driver = interflex
+    with booker:
+        assert booker.hour_saldo() == BookingTime(12, 34)
+        assert booker.user_is_logged_in() is True
+        bookings, open_since = booker.today_journal()
+    # the overlapping correction is merged and yesterday is ignored
+    assert bookings == [(BookingTime(8, 0), BookingTime(12, 0)), (BookingTime(12, 30), BookingTime(14, 30))]
+    assert open_since == BookingTime(15, 0)
+    assert driver.visited == [
+        LOGIN_URL,
+        HOME_URL,
+        BOOKING_URL, MAIN_URL, BOOKING_URL,
+        BOOKING_URL, MAIN_URL, BOOKING_URL,
+        MENUE_URL,
+    ]
+    assert driver.calls['click'] == 2
+    assert driver.calls['send_keys'] == 2
+    assert driver.quit_called
+    assert not site.logged_in
+    assert booker.driver is None
+    assert all(attempt.success for attempt in booker.attempts)
+
+
+def test_profile_path_is_discovered_once(interflex, booker):
+    _, driver = interflex
+    with booker:
+        assert booker.urls == URLS
+    assert booker._navigation_cache.lookup(SETTINGS.base_url) == URLS
+    driver.visited.clear()
+    with booker:
+        assert booker.user_is_logged_in() is True
+    # the cached profile needs no navigation to find the pages
+    assert driver.visited == [BOOKING_URL, MAIN_URL, BOOKING_URL, MENUE_URL]
+
+
+def test_stale_profile_path_is_discovered_again(interflex, booker):
+    _, driver = interflex
+    stale = NavigationUrls(SETTINGS.base_url, 'iflx/profile_0815/')
+    booker._navigation_cache.store(stale)
+    with booker:
+        # the page of the stale profile shows the login page, so the login is done once more
+        assert booker.user_is_logged_in() is True
+        assert booker.urls == URLS
+    assert booker._navigation_cache.lookup(SETTINGS.base_url) == URLS
+    assert driver.visited[:2] == [LOGIN_URL, stale.booking]
+    assert driver.calls['click'] == 3  # two logins and the logout
+
+    driver.visited.clear()
+    with booker:
+        assert booker.user_is_logged_in() is True
+    assert driver.visited == [BOOKING_URL, MAIN_URL, BOOKING_URL, MENUE_URL]
+
+
+def test_saldo_is_read_once_a_day(interflex, booker):
+    _, driver = interflex
+    with booker:
+        assert booker.hour_saldo() == BookingTime(12, 34)
+    loads = driver.calls['get']
+    with booker:
+        # the login page is still shown after the logout and the cached saldo of today needs no page load
+        assert booker.hour_saldo() == BookingTime(12, 34)
+        assert driver.calls['get'] == loads
+        assert booker.hour_saldo(refresh=True) == BookingTime(12, 34)
+    assert driver.visited.count(HOME_URL) == 2
+
+
+def test_today_bookings_include_open_booking(interflex, booker):
+    with booker:
+        bookings = booker.today_bookings()
+    assert bookings[:3] == [
+        (BookingTime(8, 0), BookingTime(12, 0)),
+        (BookingTime(12, 30), BookingTime(14, 0)),
+        (BookingTime(13, 30), BookingTime(14, 30)),
+    ]
+    assert bookings[3][0] == BookingTime(15, 0)
+
+
+def test_toggle_and_armed_click(interflex, booker):
+    site, driver = interflex
+    with booker:
+        booker.full_state_toggle()
+        assert not site.clocked_in
+        assert booker.user_is_logged_in() is False
+        assert booker.arm_booking_button() is False
+        loads = driver.calls['get']
+        booker.click_armed_button()
+        # the armed click is the only request at the target time
+        assert driver.calls['get'] == loads
+        assert site.clocked_in
+
+
+def test_failed_login_quits_the_driver(interflex, booker):
+    site, driver = interflex
+    site.failing_urls.add(LOGIN_URL)
+    with pytest.raises(WebDriverException):
+        with booker:
+            pass
+    assert driver.visited == [LOGIN_URL, LOGIN_URL]
+    assert [attempt.success for attempt in booker.attempts] == [False, False]
+    assert driver.quit_called
+    with pytest.raises(RuntimeError):
+        booker.hour_saldo()
+
+
+def test_hedged_launch_keeps_the_first_ready_driver(monkeypatch, booker):
+    site = FakeInterflex()
+    drivers = {driver_type: FakeWebDriver(site.render, site.on_click) for driver_type in DriverType}
+    launch_times = {DriverType.edge: 0.3, DriverType.firefox: 0.05}
+
+    def launch_driver(_self, driver_type):
+        if driver_type not in launch_times:
+            raise WebDriverException(f"{driver_type.name} is not installed")
+        time.sleep(launch_times[driver_type])
+        return drivers[driver_type]
+
+    monkeypatch.setattr(SeleniumTimeBooker, '_launch_driver', launch_driver)
+    winner = booker._launch_hedged(list(DriverType))
+    assert winner is drivers[DriverType.firefox]
+    assert winner.visited == [LOGIN_URL]
+    assert not winner.quit_called
+    # the slower browser is shut down once it is up
+    deadline = time.monotonic() + 5
+    while not drivers[DriverType.edge].quit_called and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert drivers[DriverType.edge].quit_called
+    assert booker._launch_stats.latency(DriverType.chrome).failures == 1
+    assert booker._launch_stats.preferred() == DriverType.firefox
+
+    launch_times.clear()
+    with pytest.raises(WebDriverException):
+        booker._launch_hedged([DriverType.edge, DriverType.chrome])
+
+
+def test_session_is_restored_from_cookies(interflex, booker):
+    site, driver = interflex
+    booker.reuse_session = True
+    with booker:
+        pass
+    # the session stays open on the server and its cookies are kept for the next run
+    assert site.logged_in
+    assert booker._session_store.load(SETTINGS.base_url, 1234) == driver.cookies
+    driver.cookies.clear()
+    driver.visited.clear()
+    clicks = driver.calls['click']
+    with booker:
+        assert booker.user_is_logged_in() is True
+    assert driver.calls['click'] == clicks
+    assert driver.cookies == [{'name': 'JSESSIONID', 'value': 'session-of-the-pin-login'}]
+    assert LOGIN_URL not in driver.visited
+
+
+def test_expired_session_falls_back_to_the_pin_login(interflex, booker):
+    site, driver = interflex
+    booker.reuse_session = True
+    with booker:
+        pass
+    site.logged_in = False
+    clicks = driver.calls['click']
+    with booker:
+        assert booker.user_is_logged_in() is True
+    # the store was cleared and filled again with the cookies of the new login
+    assert driver.calls['click'] == clicks + 1
+    assert booker._session_store.load(SETTINGS.base_url, 1234) != []
+
+
+def test_unusable_cookies_fall_back_to_the_pin_login(monkeypatch, interflex, booker):
+    site, driver = interflex
+    booker.reuse_session = True
+    booker._session_store.save(SETTINGS.base_url, 1234, [{'name': 'JSESSIONID', 'value': 'x', 'domain': 'other'}])
+
+    def add_cookie(_cookie):
+        raise InvalidCookieDomainException("invalid cookie domain")
+    monkeypatch.setattr(driver, 'add_cookie', add_cookie)
+    with booker:
+        assert booker._session_store.load(SETTINGS.base_url, 1234) == []
+        assert booker.user_is_logged_in() is True
+    assert site.logged_in
+    assert driver.calls['click'] == 1
+
+
+@pytest.fixture(name='parallel')
+def fixture_parallel(interflex, booker):
+    site, driver = interflex
+    driver.on_script = site.fetch_status
+    with booker:
+        yield site, driver, booker
+
+
+def test_parallel_fetch_merges_both_pages(parallel):
+    site, driver, booker = parallel
+    snapshot = booker.status_snapshot(parallel=True)
+    assert snapshot.saldo == BookingTime(12, 34)
+    assert snapshot.clocked_in is True
+    assert snapshot.bookings == [(BookingTime(8, 0), BookingTime(12, 0)), (BookingTime(12, 30), BookingTime(14, 30))]
+    assert snapshot.open_since == BookingTime(15, 0)
+    assert site.fetched == [BOOKING_URL, MAIN_URL, HOME_URL, BOOKING_URL]
+    assert driver.calls['execute_async_script'] == 1
+
+    # same content as the sequential way
+    sequential = booker.status_snapshot(parallel=False)
+    assert sequential.fingerprint == snapshot.fingerprint
+    assert sequential == snapshot
+
+
+def test_parallel_fetch_skips_the_known_saldo(parallel):
+    site, _, booker = parallel
+    assert booker.hour_saldo() == BookingTime(12, 34)
+    site.clocked_in = False
+    snapshot = booker.status_snapshot(parallel=True)
+    assert HOME_URL not in site.fetched
+    assert snapshot.saldo == BookingTime(12, 34)
+    assert snapshot.clocked_in is False
+    assert snapshot.open_since is None
+
+
+def test_parallel_fetch_errors(parallel):
+    site, driver, booker = parallel
+    site.script_error = 'TypeError: Failed to fetch'
+    with pytest.raises(RuntimeError, match='Failed to fetch'):
+        booker.status_snapshot(parallel=True)
+
+    site.script_error = None
+    # e.g. the session expired and the booking page is the login page
+    site.logged_in = False
+    with pytest.raises(RuntimeError, match='button not found'):
+        booker.status_snapshot(parallel=True)
+    assert driver.calls['execute_async_script'] == 2
+    site.logged_in = True
+
+
+def test_expand_table_colspan():
+    table = SeleniumTimeBooker._expand_table(
+        headers=['Datum', 'Tag', 'Kommen'],
+        cells=[('01.01.', None), ('Mo', None), ('8:00', None), ('', '2'), ('12:30', None)],
+    )
+    assert table == [['Datum', 'Tag', 'Kommen'], ['01.01.', 'Mo', '8:00'], ['', '', '12:30']]
@@ -0,0 +1,21 @@
+from work_clock.cache import JsonCache
+from work_clock.launch_stats import LaunchStats
+from work_clock.settings import DriverType
+
+
+def test_launch_stats(tmp_path):
+    stats = LaunchStats(JsonCache('launch_latencies.json', directory=tmp_path))
+    assert stats.preferred() is None
+    stats.record(DriverType.edge, 4.0)
+    stats.record(DriverType.edge, 2.0)
+    stats.record(DriverType.chrome, 3.0)
+    stats.record(DriverType.firefox, 1.0, success=False)
+
+    edge = stats.latency(DriverType.edge)
+    assert edge.launches == 2
+    assert edge.last_seconds == 2.0
+    assert edge.average_seconds == 3.4
+    assert stats.latency(DriverType.firefox).failures == 1
+    # a driver that never started is tried last
+    assert stats.ranked() == [DriverType.chrome, DriverType.edge, DriverType.firefox, DriverType.remote]
+    assert stats.preferred([DriverType.edge, DriverType.firefox]) == DriverType.edge
@@ -0,0 +1,37 @@
+import logging
+
+from work_clock.log_buffer import RingBufferHandler
+
+
+class CountingArgument:
+    def __init__(self):
+        self.formatted = 0
+
+    def __str__(self):
+        self.formatted += 1
+        return 'argument'
+
+
+def test_ring_buffer_is_bounded_and_lazy():
+    handler = RingBufferHandler(capacity=3)
+    logger = logging.getLogger('test_log_buffer')
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(handler)
+    try:
+        argument = CountingArgument()
+        for number in range(5):
+            logger.info("Message %d with %s", number, argument)
+        logger.warning("Last message")
+    finally:
+        logger.removeHandler(handler)
+    # nothing is formatted before somebody reads the buffer
+    assert argument.formatted == 0
+    assert [number for number, _ in handler.records_since()] == [4, 5, 6]
+
+    sequence, lines = handler.lines_since(0)
+    assert sequence == 6
+    assert lines[0].endswith("Message 3 with argument")
+    assert argument.formatted == 2
+    assert handler.lines_since(sequence) == (6, [])
+    assert handler.lines_since(4, level=logging.WARNING)[1][0].endswith("Last message")
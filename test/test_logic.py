@@ -0,0 +1,95 @@
+from datetime import datetime
+
+import pytest
+
+from fake_interflex import FakeInterflex, make_booker
+from fake_webdriver import FakeWebDriver
+from work_clock.interflex_requests import SeleniumTimeBooker
+from work_clock.logic import ClockState
+from work_clock.settings import UserSettings
+from work_clock.time_evaluation import BookingTime
+
+
+@pytest.fixture(name='site')
+def fixture_site(monkeypatch, tmp_path):
+    site = FakeInterflex()
+    monkeypatch.setattr(SeleniumTimeBooker, '_launch_driver',
+                        lambda self, driver_type: FakeWebDriver(site.render, site.on_click))
+    monkeypatch.setattr(SeleniumTimeBooker, 'service_is_reachable', staticmethod(lambda: True))
+    monkeypatch.setattr(UserSettings, 'parallel_fetch', property(lambda self: False))
+    monkeypatch.setattr(ClockState, '_new_booker', staticmethod(lambda: make_booker(tmp_path)))
+    return site
+
+
+@pytest.fixture(name='parsed_tables')
+def fixture_parsed_tables(monkeypatch):
+    tables = []
+    original = SeleniumTimeBooker._table_to_booking_list
+
+    def counting(table, **kwargs):
+        tables.append(table)
+        return original(table, **kwargs)
+    monkeypatch.setattr(SeleniumTimeBooker, '_table_to_booking_list', staticmethod(counting))
+    return tables
+
+
+def test_first_update_publishes_all_fields(site):
+    clock = ClockState()
+    events = []
+    clock.subscribe(events.append)
+    clock.update_status(force=True)
+
+    assert site.clocked_in is True
+    assert events[0] == {'vpn_connected': (None, True)}
+    assert set(events[1]) == {'saldo', 'clocked_in', 'bookings', 'open_since'}
+    assert events[1]['saldo'] == (None, BookingTime(12, 34))
+    assert events[1]['open_since'] == (None, BookingTime(15, 0))
+
+
+def test_unchanged_pages_skip_recomputation(site, parsed_tables):
+    clock = ClockState()
+    clock.update_status(force=True)
+    bookings = clock._bookings
+    assert len(parsed_tables) == 1
+
+    events = []
+    clock.subscribe(events.append)
+    before = datetime(2000, 1, 1)
+    clock._last_check = before
+    clock.update_status(force=True)
+
+    assert site.clocked_in is True
+    assert not events
+    assert clock._bookings is bookings
+    assert len(parsed_tables) == 1
+    # the check itself counts, even if nothing changed
+    assert clock._last_check > before
+
+
+def test_changed_pages_publish_the_difference(site):
+    clock = ClockState()
+    clock.update_status(force=True)
+    events = []
+    unsubscribe = clock.subscribe(events.append)
+
+    site.clocked_in = False
+    clock.update_status(force=True)
+    assert events == [{
+        'clocked_in': (True, False),
+        'open_since': (BookingTime(15, 0), None),
+    }]
+
+    unsubscribe()
+    site.clocked_in = True
+    clock.update_status(force=True)
+    assert len(events) == 1
+
+
+def test_failing_subscriber_does_not_break_the_update(site):
+    clock = ClockState()
+
+    def failing(changes):
+        raise RuntimeError(changes)
+    clock.subscribe(failing)
+    clock.update_status(force=True)
+    assert clock.clocked_in is True
@@ -0,0 +1,23 @@
+from work_clock.cache import JsonCache
+from work_clock.navigation import NavigationCache, NavigationUrls, find_profile_path, DEFAULT_PROFILE_PATH
+
+
+def test_find_profile_path():
+    assert find_profile_path([
+        'https://iflx.example.com/WebClient/iflx/pin.jsp',
+        None,
+        'https://iflx.example.com/WebClient/iflx/profile_4711/main.jsp?lang=de',
+    ]) == 'iflx/profile_4711/'
+    assert find_profile_path(['menue.jsp', '']) is None
+
+
+def test_navigation_cache(tmp_path):
+    cache = NavigationCache(JsonCache('navigation.json', directory=tmp_path))
+    assert cache.lookup('https://iflx.example.com/WebClient/') is None
+    urls = NavigationUrls('https://iflx.example.com/WebClient/', 'iflx/profile_4711/')
+    cache.store(urls)
+    assert cache.lookup('https://iflx.example.com/WebClient/') == urls
+    assert urls.booking == 'https://iflx.example.com/WebClient/iflx/profile_4711/bookingsmain.jsp'
+    assert NavigationUrls('https://other.example.com/').profile_path == DEFAULT_PROFILE_PATH
+    cache.invalidate('https://iflx.example.com/WebClient/')
+    assert cache.lookup('https://iflx.example.com/WebClient/') is None
@@ -0,0 +1,81 @@
+from work_clock.planner import Planner, WorkedTimeCurve
+from work_clock.time_evaluation import BookingTime, DailyBookings, TimeBookingList
+
+
+BREAK_TIMES: TimeBookingList = [
+    (BookingTime(9, 15), BookingTime(9, 30)),
+    (BookingTime(12, 30), BookingTime(13, 0)),
+]
+
+
+def test_worked_time_curve_matches_daily_bookings():
+    curve = WorkedTimeCurve(BookingTime(8, 0), BREAK_TIMES)
+    for minute in range(8 * 60, 20 * 60, 7):
+        clock_out = BookingTime(0, minute)
+        expected = DailyBookings([(BookingTime(8, 0), clock_out)], break_times=BREAK_TIMES).total
+        assert curve.worked_at(clock_out) == expected
+    worked = curve.worked_at_many(range(24 * 60))
+    assert all(earlier <= later for earlier, later in zip(worked, worked[1:]))
+
+
+def test_worked_time_curve_clock_out():
+    curve = WorkedTimeCurve(BookingTime(8, 0), BREAK_TIMES, already_worked=BookingTime(1, 0))
+    assert curve.clock_out_for(BookingTime(7, 0)) == BookingTime(14, 45)
+    assert curve.clock_out_for(BookingTime(0, 30)) == BookingTime(8, 0)
+    assert curve.clock_out_for(BookingTime(24, 0)) is None
+
+
+def test_clock_out_options():
+    planner = Planner(7.0, break_variants={
+        'short': BREAK_TIMES,
+        'long lunch': [(BookingTime(12, 0), BookingTime(13, 0))],
+    })
+    options = planner.clock_out_options(BookingTime(8, 0))
+    assert options == {'short': BookingTime(15, 45), 'long lunch': BookingTime(16, 0)}
+
+
+def test_plan_week():
+    planner = Planner(7.0, break_variants={'short': BREAK_TIMES})
+    plan = planner.plan_week(
+        current_saldo=BookingTime(-1, 0),
+        target_saldo=BookingTime(1, 0),
+        arrivals=[BookingTime(8, 0)] * 4,
+    )
+    # 2 extra hours are spread evenly over 4 days
+    assert [day.clock_out for day in plan.days] == [BookingTime(16, 15)] * 4
+    assert plan.final_saldo == BookingTime(1, 0)
+    assert plan.latest_clock_out == BookingTime(16, 15)
+
+    plan = planner.plan_week(
+        current_saldo=BookingTime(0, 0),
+        target_saldo=BookingTime(0, 3),
+        arrivals=[BookingTime(8, 0)] * 2,
+        already_worked=[BookingTime(2, 0)],
+    )
+    assert plan.final_saldo == BookingTime(0, 3)
+    assert plan.latest_clock_out == BookingTime(14, 47)
+
+    assert planner.plan_week(BookingTime(0, 0), BookingTime(100, 0), [BookingTime(8, 0)]) is None
+
+
+def test_today_can_not_end_in_the_past():
+    planner = Planner(7.0, break_variants={'short': BREAK_TIMES})
+    now = BookingTime(17, 0)
+    # arrived at 7:00 and still clocked in, so it is too late for the clock outs of a normal day
+    options = planner.clock_out_options(BookingTime(7, 0), earliest_clock_out=now)
+    assert options == {'short': now}
+    assert planner.clock_out_options(BookingTime(7, 0)) == {'short': BookingTime(14, 45)}
+
+    plan = planner.plan_week(
+        current_saldo=BookingTime(2, 0),
+        target_saldo=BookingTime(0, 0),
+        arrivals=[BookingTime(7, 0), BookingTime(8, 0)],
+        already_worked=[BookingTime(0, 0)],
+        earliest_clock_out=now,
+    )
+    # leaving now gives 9:15 today, so tomorrow is shortened to reach the target
+    assert plan.days[0].clock_out == now
+    assert plan.days[0].worked == BookingTime(9, 15)
+    assert plan.days[1].worked == BookingTime(2, 45)
+    assert plan.days[1].clock_out == BookingTime(11, 0)
+    assert plan.final_saldo == BookingTime(0, 0)
@@ -0,0 +1,26 @@
+import pstats
+
+from work_clock.profiling import profile_refresh
+from work_clock.time_evaluation import BookingTime, normalize_bookings
+
+
+class StubClockState:
+    def __init__(self):
+        self.forced = []
+
+    def update_status(self, force: bool = False) -> None:
+        self.forced.append(force)
+        if len(self.forced) == 2:
+            raise RuntimeError("Interflex is not reachable")
+        normalize_bookings([(BookingTime(8, 0), BookingTime(12, 0)), (BookingTime(7, 0), BookingTime(9, 0))])
+
+
+def test_profile_refresh(tmp_path):
+    clock = StubClockState()
+    profile_path, summary = profile_refresh(clock, cycles=3, output_path=tmp_path / 'refresh.prof')
+    # every cycle is a fresh refresh and a failed cycle does not abort the profile
+    assert clock.forced == [True, True, True]
+    assert summary.startswith('3 refresh cycles: ')
+    assert 'normalize_bookings' in summary
+    assert profile_path.with_suffix('.txt').read_text(encoding='utf-8') == summary
+    assert pstats.Stats(str(profile_path)).total_calls > 0
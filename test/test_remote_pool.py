@@ -0,0 +1,124 @@
+import os
+
+import pytest
+from selenium import webdriver
+from selenium.common import WebDriverException
+from urllib3.exceptions import MaxRetryError
+
+from work_clock.remote_pool import RemoteSessionPool
+
+
+class StubRemoteDriver:
+    def __init__(self, endpoint: str):
+        self.endpoint = endpoint
+        self.alive = True
+        self.cookies_deleted = 0
+        self.quit_called = False
+        self.visited = []
+
+    @property
+    def current_url(self) -> str:
+        if not self.alive:
+            raise WebDriverException("invalid session id")
+        return self.visited[-1] if self.visited else 'data:,'
+
+    def get(self, url: str) -> None:
+        self.visited.append(url)
+
+    def delete_all_cookies(self) -> None:
+        self.cookies_deleted += 1
+
+    def quit(self) -> None:
+        self.quit_called = True
+
+
+ENDPOINTS = ['http://node-1:4444', 'http://node-2:4444']
+
+
+def test_concurrent_sessions_are_spread_and_reused():
+    pool = RemoteSessionPool(max_idle_per_endpoint=1)
+    first = pool.acquire(ENDPOINTS, StubRemoteDriver)
+    second = pool.acquire(ENDPOINTS, StubRemoteDriver)
+    assert {first.endpoint, second.endpoint} == set(ENDPOINTS)
+    assert pool.owns(first) and pool.owns(second)
+
+    pool.release(first)
+    assert first.cookies_deleted == 1
+    assert first.visited == ['about:blank']
+    assert pool.idle(first.endpoint) == 1
+    # the idle session is preferred over a new one
+    assert pool.acquire(ENDPOINTS, StubRemoteDriver) is first
+
+    pool.release(first)
+    pool.release(second)
+    pool.close()
+    assert first.quit_called and second.quit_called
+    assert not pool.owns(first)
+    assert all(pool.active(endpoint) == 0 for endpoint in ENDPOINTS)
+
+
+def test_expired_session_and_failing_endpoint():
+    pool = RemoteSessionPool()
+    expired = pool.acquire(ENDPOINTS[:1], StubRemoteDriver)
+    pool.release(expired)
+    expired.alive = False
+
+    def connect(endpoint: str) -> StubRemoteDriver:
+        if endpoint == ENDPOINTS[0]:
+            raise WebDriverException("node is down")
+        return StubRemoteDriver(endpoint)
+
+    driver = pool.acquire(ENDPOINTS, connect)
+    assert expired.quit_called
+    assert driver.endpoint == ENDPOINTS[1]
+    assert pool.active(ENDPOINTS[0]) == 0
+    with pytest.raises(WebDriverException):
+        pool.acquire(ENDPOINTS[:1], connect)
+    with pytest.raises(RuntimeError):
+        pool.acquire([], connect)
+
+
+def test_unreachable_endpoint_fails_over():
+    pool = RemoteSessionPool()
+
+    def connect(endpoint: str) -> StubRemoteDriver:
+        if endpoint == ENDPOINTS[0]:
+            # what webdriver.Remote raises, if nothing listens on the endpoint
+            raise MaxRetryError(None, endpoint, ConnectionRefusedError("Connection refused"))
+        return StubRemoteDriver(endpoint)
+
+    driver = pool.acquire(ENDPOINTS, connect)
+    assert driver.endpoint == ENDPOINTS[1]
+    assert pool.active(ENDPOINTS[0]) == 0
+    with pytest.raises(MaxRetryError):
+        pool.acquire(ENDPOINTS[:1], connect)
+    assert pool.active(ENDPOINTS[0]) == 0
+
+    def broken(endpoint: str) -> StubRemoteDriver:
+        raise ValueError(endpoint)
+    # unexpected errors are raised right away, but do not count as a session in use
+    with pytest.raises(ValueError):
+        pool.acquire(ENDPOINTS[:1], broken)
+    assert pool.active(ENDPOINTS[0]) == 0
+
+
+@pytest.mark.skipif('WORK_CLOCK_GRID_URL' not in os.environ,
+                    reason="needs a Selenium server, e.g. `docker run -p 4444:4444 selenium/standalone-chrome`")
+def test_standalone_selenium_server():
+    pool = RemoteSessionPool()
+    endpoints = [os.environ['WORK_CLOCK_GRID_URL']]
+
+    def connect(endpoint: str) -> webdriver.Remote:
+        options = webdriver.ChromeOptions()
+        options.add_argument('--headless')
+        return webdriver.Remote(command_executor=endpoint, options=options)
+
+    driver = pool.acquire(endpoints, connect)
+    try:
+        driver.get('data:text/html,<p id="greeting">hello</p>')
+        assert driver.find_element('id', 'greeting').text == 'hello'
+        pool.release(driver)
+        assert pool.acquire(endpoints, connect) is driver
+        pool.release(driver)
+    finally:
+        pool.close()
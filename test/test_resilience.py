@@ -0,0 +1,61 @@
+import pytest
+
+from work_clock.resilience import RetryPolicy, CircuitBreaker, CircuitState, CircuitOpenError
+
+
+def test_retry_policy_backoff():
+    policy = RetryPolicy(max_attempts=5, base_delay=0.5, max_delay=3.0)
+    assert [policy.delay(attempt) for attempt in range(1, 6)] == [0.5, 1.0, 2.0, 3.0, 3.0]
+
+
+def test_circuit_breaker():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60.0, clock=lambda: now[0])
+    assert breaker.state == CircuitState.closed
+    breaker.record_failure()
+    breaker.check()
+    breaker.record_failure()
+    assert breaker.state == CircuitState.open
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+
+    now[0] = 61.0
+    assert breaker.state == CircuitState.half_open
+    breaker.check()
+    # a failing trial call opens the circuit right away
+    breaker.record_failure()
+    assert breaker.state == CircuitState.open
+
+    now[0] = 122.0
+    breaker.record_success()
+    assert breaker.state == CircuitState.closed
+    breaker.record_failure()
+    assert breaker.state == CircuitState.closed
+
+
+def test_circuit_breaker_lets_one_trial_through():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60.0, clock=lambda: now[0])
+    breaker.record_failure()
+    now[0] = 61.0
+    breaker.check()
+    # concurrent callers wait for the outcome of the trial
+    with pytest.raises(CircuitOpenError, match='trial'):
+        breaker.check()
+    breaker.record_failure()
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+
+    now[0] = 122.0
+    breaker.check()
+    breaker.record_success()
+    breaker.check()
+    breaker.check()
+    assert breaker.state == CircuitState.closed
+
+    # a trial that never reports back is given up after the reset timeout
+    breaker.record_failure()
+    now[0] = 183.0
+    breaker.check()
+    now[0] = 243.0
+    breaker.check()
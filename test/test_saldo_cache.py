@@ -0,0 +1,18 @@
+import datetime
+
+from work_clock.cache import JsonCache
+from work_clock.saldo_cache import SaldoCache
+from work_clock.time_evaluation import BookingTime
+
+
+def test_saldo_cache_is_day_scoped(tmp_path):
+    cache = SaldoCache(JsonCache('saldo_cache.json', directory=tmp_path, private=True))
+    today = datetime.date(2024, 3, 4)
+    assert cache.lookup('https://iflx.example.com/', 42, day=today) is None
+    cache.store('https://iflx.example.com/', 42, BookingTime(-1, -30), day=today)
+    assert cache.lookup('https://iflx.example.com/', 42, day=today) == BookingTime(-1, -30)
+    assert cache.lookup('https://iflx.example.com/', 43, day=today) is None
+    # the saldo of yesterday is outdated after midnight
+    assert cache.lookup('https://iflx.example.com/', 42, day=today + datetime.timedelta(days=1)) is None
+    cache.clear('https://iflx.example.com/', 42)
+    assert cache.lookup('https://iflx.example.com/', 42, day=today) is None
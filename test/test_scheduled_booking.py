@@ -0,0 +1,83 @@
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from work_clock.logic import ClockState
+from work_clock.scheduled_booking import ScheduledBooking
+
+
+class StubBooker:
+    def __init__(self, clocked_in: bool):
+        self.clocked_in = clocked_in
+        self.calls = []
+        self.attempts = []
+
+    def __enter__(self):
+        self.calls.append(('enter', time.time()))
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.calls.append(('exit', time.time()))
+
+    def arm_booking_button(self) -> bool:
+        self.calls.append(('arm', time.time()))
+        return self.clocked_in
+
+    def click_armed_button(self) -> None:
+        self.calls.append(('click', time.time()))
+
+
+@pytest.fixture(name='clock_with_booker')
+def fixture_clock_with_booker(monkeypatch):
+    def create(clocked_in: bool) -> tuple[ClockState, StubBooker]:
+        booker = StubBooker(clocked_in)
+        monkeypatch.setattr(ClockState, '_new_booker', staticmethod(lambda: booker))
+        return ClockState(), booker
+    return create
+
+
+def test_scheduled_clock_out_is_armed_ahead(clock_with_booker):
+    clock, booker = clock_with_booker(clocked_in=True)
+    target = datetime.now() + timedelta(seconds=0.4)
+    scheduled = clock.schedule_booking(target, clock_in=False, lead_time=0.2)
+    assert scheduled.wait_done(timeout=5)
+    assert scheduled.error is None
+    assert [call for call, _ in booker.calls] == ['enter', 'arm', 'click', 'exit']
+    # the session is prepared before the target, only the click happens at the target
+    calls = dict(booker.calls)
+    assert calls['arm'] < target.timestamp() <= calls['click']
+    assert 0 <= scheduled.offset < 0.1
+    assert 'booked' in scheduled.describe()
+
+
+def test_scheduled_booking_skips_reached_state(clock_with_booker):
+    clock, booker = clock_with_booker(clocked_in=False)
+    scheduled = clock.schedule_booking(datetime.now() + timedelta(seconds=0.2), clock_in=False, lead_time=0.1)
+    assert scheduled.wait_done(timeout=5)
+    assert scheduled.skipped
+    assert 'click' not in dict(booker.calls)
+
+
+def test_scheduled_booking_cancel(clock_with_booker):
+    clock, booker = clock_with_booker(clocked_in=True)
+    scheduled = clock.schedule_booking(datetime.now() + timedelta(seconds=30), clock_in=False, lead_time=10)
+    with pytest.raises(RuntimeError):
+        clock.schedule_booking(datetime.now() + timedelta(seconds=60), clock_in=False)
+    clock.cancel_scheduled_booking()
+    assert scheduled.wait_done(timeout=5)
+    assert scheduled.cancelled
+    assert booker.calls == []
+
+
+def test_scheduled_booking_in_the_past(clock_with_booker):
+    clock, _ = clock_with_booker(clocked_in=True)
+    with pytest.raises(ValueError):
+        clock.schedule_booking(datetime.now() - timedelta(minutes=1), clock_in=False)
+
+
+def test_wait_until_is_precise():
+    scheduled = ScheduledBooking(datetime.now() + timedelta(seconds=1), clock_in=True)
+    moment = time.time() + 0.1
+    assert scheduled.wait_until(moment)
+    assert 0 <= time.time() - moment < 0.01
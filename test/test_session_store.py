@@ -0,0 +1,23 @@
+import stat
+from platform import system
+
+from work_clock.cache import JsonCache
+from work_clock.session_store import SessionStore
+
+
+def test_session_store_roundtrip(tmp_path):
+    store = SessionStore(JsonCache('session.json', directory=tmp_path, private=True))
+    cookies = [{'name': 'JSESSIONID', 'value': 'abc123', 'path': '/WebClient'}]
+    assert store.load('https://iflx.example.com/', 42) == []
+    store.save('https://iflx.example.com/', 42, cookies)
+    assert store.load('https://iflx.example.com/', 42) == cookies
+    assert store.load('https://iflx.example.com/', 43) == []
+    store.clear('https://iflx.example.com/', 42)
+    assert store.load('https://iflx.example.com/', 42) == []
+
+
+def test_session_store_permissions(tmp_path):
+    cache = JsonCache('session.json', directory=tmp_path, private=True)
+    SessionStore(cache).save('https://iflx.example.com/', 42, [])
+    if system() != 'Windows':
+        assert stat.S_IMODE(cache.file_path.stat().st_mode) == 0o600
@@ -71,3 +71,53 @@ def test_webdriver(settings):
     assert settings.webdriver == default_value
     settings.webdriver = test_value
     assert settings.webdriver == test_value
+
+
+def test_reuse_session(settings):
+    default_value = False
+    test_value = True
+    assert settings.reuse_session == default_value
+    settings.reuse_session = test_value
+    assert settings.reuse_session == test_value
+
+
+def test_parallel_fetch(settings):
+    default_value = False
+    test_value = True
+    assert settings.parallel_fetch == default_value
+    settings.parallel_fetch = test_value
+    assert settings.parallel_fetch == test_value
+
+
+def test_refresh_window(settings):
+    default_value = 10.0
+    test_value = 2.5
+    assert settings.refresh_window == default_value
+    settings.refresh_window = test_value
+    assert settings.refresh_window == test_value
+
+
+def test_hedged_drivers(settings):
+    default_value = []
+    test_value = [DriverType.firefox, DriverType.edge]
+    assert settings.hedged_drivers == default_value
+    settings.hedged_drivers = test_value
+    assert settings.hedged_drivers == test_value
+
+
+def test_grid_endpoints(settings):
+    default_value = ['http://localhost:4444']
+    test_value = ['http://node-1:4444', 'http://node-2:4444']
+    assert settings.grid_endpoints == default_value
+    settings.grid_endpoints = test_value
+    assert settings.grid_endpoints == test_value
+
+
+def test_grid_browser(settings):
+    default_value = DriverType.chrome
+    test_value = DriverType.firefox
+    assert settings.grid_browser == default_value
+    settings.grid_browser = test_value
+    assert settings.grid_browser == test_value
+    with pytest.raises(ValueError):
+        settings.grid_browser = DriverType.remote
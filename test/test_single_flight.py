@@ -0,0 +1,62 @@
+import threading
+
+import pytest
+
+from work_clock.single_flight import SingleFlight
+
+
+def test_concurrent_calls_join():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow_operation():
+        calls.append(1)
+        started.set()
+        release.wait(timeout=5)
+        return len(calls)
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do('update', slow_operation)))
+    leader.start()
+    started.wait(timeout=5)
+    followers = [threading.Thread(target=lambda: results.append(flight.do('update', slow_operation)))
+                 for _ in range(3)]
+    for follower in followers:
+        follower.start()
+    release.set()
+    for thread in [leader] + followers:
+        thread.join(timeout=5)
+    assert calls == [1]
+    assert results == [1, 1, 1, 1]
+
+
+def test_fresh_window():
+    now = [0.0]
+    flight = SingleFlight(clock=lambda: now[0])
+    counter = iter(range(100))
+    assert flight.do('update', lambda: next(counter), fresh_for=10.0) == 0
+    now[0] = 5.0
+    assert flight.do('update', lambda: next(counter), fresh_for=10.0) == 0
+    assert flight.do('update', lambda: next(counter)) == 1
+    now[0] = 20.0
+    assert flight.do('update', lambda: next(counter), fresh_for=10.0) == 2
+    flight.forget('update')
+    assert flight.do('update', lambda: next(counter), fresh_for=10.0) == 3
+
+
+def test_errors_are_not_cached():
+    flight = SingleFlight()
+
+    def failing():
+        raise RuntimeError("server down")
+
+    with pytest.raises(RuntimeError):
+        flight.do('update', failing, fresh_for=10.0)
+    assert flight.do('update', lambda: 'ok', fresh_for=10.0) == 'ok'
+
+
+def test_nested_call_from_same_thread():
+    flight = SingleFlight()
+    assert flight.do('update', lambda: flight.do('update', lambda: 'inner')) == 'inner'
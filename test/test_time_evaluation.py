@@ -1,4 +1,6 @@
-from work_clock.time_evaluation import BookingTime, TimeBookingList, DailyBookings
+import random
+
+from work_clock.time_evaluation import BookingTime, TimeBookingList, DailyBookings, normalize_bookings
 
 
 def test_booking_time_basics():
@@ -119,3 +121,60 @@ def test_daily_bookings_done_time():
     ]
     assert DailyBookings(bookings=too_much, break_times=break_times, normal_hours_per_day=7.0,
                          ).done_for_today == BookingTime(14, 15)
+
+
+def test_daily_bookings_cache_invalidation():
+    break_times: TimeBookingList = [
+        (BookingTime(9, 15), BookingTime(9, 30)),
+        (BookingTime(12, 30), BookingTime(13, 0)),
+    ]
+    bookings = DailyBookings(bookings=[(BookingTime(9, 0), BookingTime(10, 0))], break_times=break_times,
+                             normal_hours_per_day=7.0)
+    assert bookings.total == BookingTime(0, 45)
+    assert bookings.daily_saldo == BookingTime(-6, -15)
+    assert bookings.done_for_today == BookingTime(16, 45)
+
+    bookings.add(BookingTime(12, 0), BookingTime(13, 30))
+    assert bookings.total == BookingTime(1, 45)
+    assert bookings.daily_saldo == BookingTime(-5, -15)
+    assert bookings.done_for_today == BookingTime(18, 45)
+
+    bookings.add_from_string("14:00", "16:00")
+    assert bookings.total == BookingTime(3, 45)
+    assert bookings.total == DailyBookings(list(bookings), break_times=break_times).total
+    assert bookings.done_for_today == BookingTime(19, 15)
+
+
+def test_normalize_bookings():
+    bookings: TimeBookingList = [
+        (BookingTime(13, 0), BookingTime(16, 0)),
+        (BookingTime(8, 0), BookingTime(12, 0)),
+        (BookingTime(8, 0), BookingTime(12, 0)),  # duplicate punch
+        (BookingTime(11, 30), BookingTime(12, 15)),  # overlapping correction
+        (BookingTime(14, 0), BookingTime(15, 0)),  # contained in another booking
+    ]
+    assert normalize_bookings(bookings) == [
+        (BookingTime(8, 0), BookingTime(12, 15)),
+        (BookingTime(13, 0), BookingTime(16, 0)),
+    ]
+    daily_bookings = DailyBookings(bookings, break_times=[])
+    assert daily_bookings.total == BookingTime(12, 45)
+    daily_bookings.normalize()
+    assert daily_bookings.total == BookingTime(7, 15)
+    assert len(daily_bookings) == 2
+
+
+def test_normalize_bookings_randomized():
+    generator = random.Random(4711)
+    for _ in range(50):
+        bookings: TimeBookingList = []
+        worked_minutes = set()
+        for _ in range(generator.randint(0, 2000)):
+            start = generator.randint(0, 23 * 60)
+            end = start + generator.randint(1, 60)
+            bookings.append((BookingTime(0, start), BookingTime(0, end)))
+            worked_minutes.update(range(start, end))
+        normalized = normalize_bookings(bookings)
+        assert all(check_in < check_out for check_in, check_out in normalized)
+        assert all(earlier[1] <= later[0] for earlier, later in zip(normalized, normalized[1:]))
+        assert DailyBookings(normalized, break_times=[]).total == BookingTime(0, len(worked_minutes))
@@ -1,21 +1,56 @@
 import argparse
 import logging
 import sys
+from pathlib import Path
 
-from work_clock.user_interface import TimeBookingUi
+from work_clock.cli import COMMANDS
+from work_clock.log_buffer import setup_logging
 from work_clock.settings import SETTINGS
 
 
 if __name__ == '__main__':
     PARSER = argparse.ArgumentParser()
     PARSER.add_argument('-d', '--debug', action='store_true')
+    PARSER.add_argument('--daemon', action='store_true',
+                        help="keep a warm browser session and serve the status on localhost")
+    PARSER.add_argument('--port', type=int, default=None, help="port of the daemon")
+    PARSER.add_argument('command', nargs='?', choices=COMMANDS,
+                        help="run a single command without the GUI")
+    PARSER.add_argument('--json', action='store_true', help="print the command result as JSON")
+    PARSER.add_argument('--refresh', action='store_true',
+                        help="let a running daemon refresh before answering a command")
+    PARSER.add_argument('--refresh-saldo', action='store_true',
+                        help="read the saldo again, it is otherwise only read on the first update of a day")
+    PARSER.add_argument('--profile', type=int, nargs='?', const=3, default=None, metavar='CYCLES',
+                        help="profile refresh cycles without the GUI and write the profile for bug reports")
+    PARSER.add_argument('--profile-output', type=Path, default=None, help="path of the profile file")
+    PARSER.add_argument('--startup-check', action='store_true', help=argparse.SUPPRESS)
     ARGS = PARSER.parse_args(sys.argv[1:])
 
-    logging.basicConfig(
-        level=logging.DEBUG if ARGS.debug else logging.INFO,
-        format="%(asctime)s  %(levelname)-8s %(funcName)35s():  %(message)s",
-    )
+    setup_logging(level=logging.DEBUG if ARGS.debug else logging.INFO)
     SETTINGS.debug_mode = ARGS.debug
 
-    UI = TimeBookingUi()
-    UI.run()
+    if ARGS.startup_check:
+        # import everything the GUI needs and stop, the build measures how long this takes
+        import work_clock.user_interface  # pylint: disable=unused-import
+        sys.exit(0)
+    elif ARGS.profile is not None:
+        from work_clock.logic import ClockState
+        from work_clock.profiling import profile_refresh
+        PROFILE_PATH, SUMMARY = profile_refresh(ClockState(), cycles=ARGS.profile, output_path=ARGS.profile_output)
+        print(SUMMARY)
+        print(f"Profile written to {PROFILE_PATH}, summary to {PROFILE_PATH.with_suffix('.txt')}")
+        print(f"Inspect it with `python -m pstats {PROFILE_PATH}` or a viewer like snakeviz")
+        sys.exit(0)
+    elif ARGS.command is not None:
+        from work_clock.cli import run_command
+        sys.exit(run_command(ARGS.command, as_json=ARGS.json, refresh=ARGS.refresh, port=ARGS.port,
+                             refresh_saldo=ARGS.refresh_saldo))
+    elif ARGS.daemon:
+        from work_clock.daemon import ClockDaemon, DAEMON_PORT
+        DAEMON = ClockDaemon(port=ARGS.port or DAEMON_PORT)
+        DAEMON.serve_forever()
+    else:
+        from work_clock.user_interface import TimeBookingUi
+        UI = TimeBookingUi()
+        UI.run()
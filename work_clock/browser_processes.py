@@ -0,0 +1,115 @@
+import logging
+import os
+from typing import Any, Optional
+
+import psutil
+
+from work_clock.cache import JsonCache
+
+
+class BrowserProcesses:
+    # keeps track of the driver process and the browser processes it started,
+    # so that they can be cleaned up even after a crash of this application
+    def __init__(self, cache: Optional[JsonCache] = None):
+        self._cache = cache if cache is not None else JsonCache('browser_processes.json')
+        # one key per session, several sessions of this application can be alive at the same time
+        self._owner = str(os.getpid())
+        self._key: Optional[str] = None
+        self._tracked: dict[str, float] = {}
+        self._root: Optional[psutil.Process] = None
+
+    def track(self, driver: Any) -> None:
+        service_process = getattr(getattr(driver, 'service', None), 'process', None)
+        if service_process is None:
+            return
+        try:
+            self._root = psutil.Process(service_process.pid)
+        except psutil.NoSuchProcess:
+            return
+        self._key = f'{self._owner}:{service_process.pid}'
+        self.update()
+
+    def update(self) -> None:
+        if self._key is None:
+            return
+        for process in self._processes():
+            try:
+                self._tracked[str(process.pid)] = process.create_time()
+            except psutil.NoSuchProcess:
+                continue
+        tracked = dict(self._tracked)
+
+        def change(data: dict) -> None:
+            data[self._key] = tracked
+        self._cache.update(change)
+
+    def resident_memory(self) -> int:
+        # in bytes, for the driver and all of its child processes
+        rss = 0
+        for process in self._processes():
+            try:
+                rss += process.memory_info().rss
+            except psutil.NoSuchProcess:
+                continue
+        return rss
+
+    def log_resident_memory(self) -> None:
+        if self._root is not None:
+            logging.info("Browser processes use %.1f MB", self.resident_memory() / 2 ** 20)
+
+    def release(self) -> None:
+        # terminate whatever quit() left behind of this session and forget about its processes
+        if self._key is not None:
+            self._cache.update(lambda data: data.pop(self._key, None))
+        self._terminate(self._tracked)
+        self._key = None
+        self._tracked = {}
+        self._root = None
+
+    def reap_orphans(self) -> int:
+        orphans: dict[str, dict[str, float]] = {}
+        if not any(self._is_orphan(key) for key in self._cache.load()):
+            return 0
+
+        def change(data: dict) -> None:
+            for key in list(data):
+                if self._is_orphan(key):
+                    orphans[key] = data.pop(key)
+        self._cache.update(change)
+        reaped = sum(self._terminate(tracked) for tracked in orphans.values())
+        if orphans:
+            logging.info("Terminated %d orphaned browser processes", reaped)
+        return reaped
+
+    def _is_orphan(self, key: str) -> bool:
+        # the key starts with the pid of the application that started the session
+        owner = key.split(':')[0]
+        return owner != self._owner and not psutil.pid_exists(int(owner))
+
+    def _processes(self) -> list[psutil.Process]:
+        if self._root is None:
+            return []
+        try:
+            return [self._root] + self._root.children(recursive=True)
+        except psutil.NoSuchProcess:
+            return []
+
+    @staticmethod
+    def _terminate(tracked: dict[str, float]) -> int:
+        processes = []
+        for pid, create_time in tracked.items():
+            try:
+                process = psutil.Process(int(pid))
+                # the pid might have been reused by an unrelated process in the meantime
+                if process.create_time() == create_time:
+                    process.terminate()
+                    processes.append(process)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        _, alive = psutil.wait_procs(processes, timeout=3)
+        for process in alive:
+            try:
+                process.kill()
+            except psutil.NoSuchProcess:
+                continue
+        return len(processes)
@@ -0,0 +1,54 @@
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Optional
+
+from work_clock.settings import config_dir_path
+
+
+# caches of the same file can be changed from several threads, e.g. during a hedged launch
+_UPDATE_LOCK = threading.Lock()
+
+
+class JsonCache:
+    def __init__(self, file_name: str, directory: Optional[Path] = None, private: bool = False):
+        self._file_name = file_name
+        self._directory = directory
+        self._private = private
+
+    @property
+    def file_path(self) -> Path:
+        directory = self._directory if self._directory is not None else config_dir_path()
+        return directory.joinpath(self._file_name)
+
+    def load(self) -> dict:
+        if not self.file_path.is_file():
+            return {}
+        try:
+            with open(self.file_path, 'r', encoding='utf-8') as cache_file:
+                return json.loads(cache_file.read())
+        except (OSError, json.JSONDecodeError):
+            # a broken cache is just an empty cache
+            return {}
+
+    def save(self, data: dict) -> None:
+        if self._private:
+            # only the owner may read or write the file, even while it is being created
+            file_descriptor = os.open(self.file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            os.chmod(self.file_path, 0o600)
+            with os.fdopen(file_descriptor, 'w', encoding='utf-8') as cache_file:
+                cache_file.write(json.dumps(data))
+            return
+        with open(self.file_path, 'w', encoding='utf-8') as cache_file:
+            cache_file.write(json.dumps(data))
+
+    def update(self, change: Callable[[dict], None]) -> None:
+        # load, change and save without losing the changes of another thread in between
+        with _UPDATE_LOCK:
+            data = self.load()
+            change(data)
+            self.save(data)
+
+    def clear(self) -> None:
+        self.file_path.unlink(missing_ok=True)
@@ -0,0 +1,70 @@
+import json
+import sys
+from typing import Optional
+
+
+COMMANDS = ('status', 'toggle', 'saldo', 'bookings')
+
+
+def _clock_state(refresh: bool, port: Optional[int], refresh_saldo: bool = False, initial_update: bool = True):
+    # only import what is necessary: a running daemon answers from its cache within milliseconds
+    from work_clock.daemon_client import DaemonClient, RemoteClockState, DAEMON_PORT
+    daemon_client = DaemonClient(port=port or DAEMON_PORT)
+    if daemon_client.is_running():
+        clock = RemoteClockState(daemon_client)
+        if refresh or refresh_saldo:
+            clock.update_status(refresh_saldo=refresh_saldo)
+        return clock
+    from work_clock.logic import ClockState
+    clock = ClockState()
+    if initial_update:
+        clock.update_status(refresh_saldo=refresh_saldo)
+    return clock
+
+
+def _command_result(command: str, refresh: bool, port: Optional[int], refresh_saldo: bool = False) -> dict:
+    match command:
+        case 'status':
+            return _clock_state(refresh, port, refresh_saldo).as_dict()
+        case 'toggle':
+            # the toggle reads the current state itself, only the new one has to be fetched afterwards
+            clock = _clock_state(False, port, initial_update=False)
+            clock.toggle_clock()
+            clock.update_status()
+            return clock.as_dict()
+        case 'saldo':
+            clock = _clock_state(refresh, port, refresh_saldo)
+            return {'saldo': clock.saldo, 'last_check': clock.last_check}
+        case 'bookings':
+            clock = _clock_state(refresh, port)
+            return {'bookings': clock.bookings, 'last_check': clock.last_check}
+        case _:
+            raise NotImplementedError(f"Command '{command}' is not implemented")
+
+
+def format_table(result: dict) -> str:
+    def cell(value) -> str:
+        match value:
+            case None: return '?'
+            case True: return 'yes'
+            case False: return 'no'
+        return str(value)
+
+    lines = []
+    width = max(len(key) for key in result)
+    for key, value in result.items():
+        if key == 'bookings':
+            value = ', '.join(f'{check_in}-{check_out}' for check_in, check_out in value) or '-'
+        lines.append(f'{key:<{width}}  {cell(value)}')
+    return '\n'.join(lines)
+
+
+def run_command(command: str, as_json: bool = False, refresh: bool = False, port: Optional[int] = None,
+                refresh_saldo: bool = False) -> int:
+    try:
+        result = _command_result(command, refresh, port, refresh_saldo)
+    except Exception as error:  # pylint: disable=broad-exception-caught
+        print(f"Error: {error!r}", file=sys.stderr)
+        return 1
+    print(json.dumps(result) if as_json else format_table(result))
+    return 0
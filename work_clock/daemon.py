@@ -0,0 +1,128 @@
+import json
+import logging
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlsplit
+
+from work_clock.daemon_client import DAEMON_HOST, DAEMON_PORT
+from work_clock.daemon_token import DaemonToken
+from work_clock.logic import ClockState
+
+
+REFRESH_INTERVAL = 300  # in seconds
+
+
+class ClockDaemon:
+    def __init__(self, port: int = DAEMON_PORT, refresh_interval: float = REFRESH_INTERVAL,
+                 token: Optional[DaemonToken] = None):
+        self._clock = ClockState(keep_session_warm=True)
+        self._refresh_interval = refresh_interval
+        self._token_file = token if token is not None else DaemonToken()
+        # all calls that talk to Interflex are serialized, status reads never wait for them
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._server = ThreadingHTTPServer((DAEMON_HOST, port), self._handler_class())
+        # only after binding, a daemon that fails to start must not replace the token of a running one
+        self._token = self._token_file.create()
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def authorized(self, authorization: Optional[str]) -> bool:
+        return DaemonToken.matches(self._token, authorization)
+
+    def status(self) -> dict:
+        # the time of today is extrapolated from the last refresh, so it is up to date anyway
+        return self._clock.as_dict()
+
+    def refresh(self, refresh_saldo: bool = False, force: bool = False) -> dict:
+        with self._lock:
+            self._clock.update_status(force=force, refresh_saldo=refresh_saldo)
+        return self.status()
+
+    def toggle(self) -> dict:
+        with self._lock:
+            self._clock.toggle_clock()
+            self._clock.update_status()
+        return self.status()
+
+    def serve_forever(self) -> None:
+        logging.info("Serving on http://%s:%d", DAEMON_HOST, self.port)
+        refresher = threading.Thread(target=self._refresh_loop, daemon=True)
+        refresher.start()
+        try:
+            self._server.serve_forever()
+        finally:
+            self._stopped.set()
+            self._server.server_close()
+            self._token_file.clear()
+            with self._lock:
+                self._clock.close()
+
+    def shutdown(self) -> None:
+        self._stopped.set()
+        self._server.shutdown()
+
+    def _refresh_loop(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                self.refresh()
+            except Exception as error:
+                logging.error("Background refresh failed: %s", repr(error))
+            self._stopped.wait(self._refresh_interval)
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        daemon = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if not self._authorized():
+                    return
+                match self.path:
+                    case '/status': self._respond(daemon.status)
+                    case _: self._send(HTTPStatus.NOT_FOUND, {'error': f"Unknown path '{self.path}'"})
+
+            def do_POST(self):
+                if not self._authorized():
+                    return
+                url = urlsplit(self.path)
+                # a forced refresh does not reuse a refresh that has just finished
+                force = parse_qs(url.query).get('force') == ['1']
+                match url.path:
+                    case '/refresh': self._respond(lambda: daemon.refresh(force=force))
+                    case '/refresh-saldo': self._respond(lambda: daemon.refresh(refresh_saldo=True, force=force))
+                    case '/toggle': self._respond(daemon.toggle)
+                    case _: self._send(HTTPStatus.NOT_FOUND, {'error': f"Unknown path '{self.path}'"})
+
+            def _authorized(self) -> bool:
+                # browsers send an origin with every cross-origin request, the daemon has no web clients
+                if self.headers.get('Origin') is not None:
+                    self._send(HTTPStatus.FORBIDDEN, {'error': "Requests from web pages are not allowed"})
+                    return False
+                if not daemon.authorized(self.headers.get('Authorization')):
+                    self._send(HTTPStatus.UNAUTHORIZED, {'error': "Missing or wrong token"})
+                    return False
+                return True
+
+            def _respond(self, action):
+                try:
+                    self._send(HTTPStatus.OK, action())
+                except Exception as error:
+                    logging.error(repr(error))
+                    self._send(HTTPStatus.INTERNAL_SERVER_ERROR, {'error': repr(error)})
+
+            def _send(self, code: HTTPStatus, data: dict):
+                body = json.dumps(data).encode()
+                self.send_response(code)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+                logging.debug(format, *args)
+
+        return Handler
@@ -0,0 +1,133 @@
+import logging
+from http import HTTPStatus
+from typing import Any, Callable, Optional
+
+import requests
+
+from work_clock.daemon_token import DaemonToken
+
+
+# everything needed to talk to a running daemon, without importing selenium and the rest of the logic
+DAEMON_HOST = '127.0.0.1'
+DAEMON_PORT = 48620
+DAEMON_TIMEOUT = 60  # in seconds, a toggle includes a full refresh
+# the fields of the status, that are reported as changes, like those of ClockState.subscribe()
+STATUS_FIELDS = ('vpn_connected', 'saldo', 'clocked_in', 'bookings')
+
+
+class DaemonClient:
+    def __init__(self, port: int = DAEMON_PORT, token: Optional[DaemonToken] = None):
+        self._url = f'http://{DAEMON_HOST}:{port}/'
+        self._token = token if token is not None else DaemonToken()
+
+    def is_running(self) -> bool:
+        # only a daemon that accepts our token is of any use, otherwise the caller works on its own
+        try:
+            response = requests.get(self._url + 'status', headers=self._headers(), timeout=0.5)
+        except requests.exceptions.RequestException:
+            return False
+        if response.status_code != HTTPStatus.OK:
+            logging.warning("Ignoring the service on %s, it answered with %d", self._url, response.status_code)
+            return False
+        return True
+
+    def status(self) -> dict:
+        return self._request('GET', 'status')
+
+    def refresh(self, refresh_saldo: bool = False, force: bool = False) -> dict:
+        path = 'refresh-saldo' if refresh_saldo else 'refresh'
+        return self._request('POST', path + ('?force=1' if force else ''))
+
+    def toggle(self) -> dict:
+        return self._request('POST', 'toggle')
+
+    def _request(self, method: str, path: str) -> dict:
+        response = requests.request(method, self._url + path, headers=self._headers(), timeout=DAEMON_TIMEOUT)
+        data = response.json()
+        if response.status_code != HTTPStatus.OK:
+            raise RuntimeError(f"Daemon error: {data.get('error')}")
+        return data
+
+    def _headers(self) -> dict[str, str]:
+        return {'Authorization': f'Bearer {self._token.load()}'}
+
+
+class RemoteClockState:
+    # offers the interface of ClockState, but is backed by a running daemon
+    def __init__(self, client: Optional[DaemonClient] = None):
+        self._client = client if client is not None else DaemonClient()
+        self._subscribers: list[Callable[[dict[str, tuple[Any, Any]]], None]] = []
+        self._status: dict = self._client.status()
+
+    def toggle_clock(self) -> None:
+        self._set_status(self._client.toggle())
+
+    def update_status(self, force: bool = False, refresh_saldo: bool = False) -> None:
+        self._set_status(self._client.refresh(refresh_saldo=refresh_saldo, force=force))
+
+    def poll_status(self) -> None:
+        # the daemon extrapolates the time of today itself, this is no request to Interflex
+        self._set_status(self._client.status())
+
+    def subscribe(self, callback: Callable[[dict[str, tuple[Any, Any]]], None]) -> Callable[[], None]:
+        self._subscribers.append(callback)
+        return lambda: self._subscribers.remove(callback)
+
+    def _set_status(self, status: dict) -> None:
+        changes = {field: (self._status.get(field), status.get(field)) for field in STATUS_FIELDS
+                   if self._status.get(field) != status.get(field)}
+        self._status = status
+        if not changes:
+            return
+        for callback in list(self._subscribers):
+            try:
+                callback(changes)
+            except Exception as error:  # pylint: disable=broad-exception-caught
+                logging.warning("Subscriber failed to handle %s: %r", ', '.join(changes), error)
+
+    @property
+    def last_check(self) -> str:
+        return self._status['last_check']
+
+    @property
+    def vpn_connected(self) -> Optional[bool]:
+        return self._status['vpn_connected']
+
+    @property
+    def clocked_in(self) -> Optional[bool]:
+        return self._status['clocked_in']
+
+    @property
+    def saldo(self) -> Optional[str]:
+        return self._status['saldo']
+
+    @property
+    def time_today(self) -> Optional[str]:
+        return self._status['time_today']
+
+    @property
+    def done_today(self) -> Optional[str]:
+        return self._status['done_today']
+
+    @property
+    def bookings(self) -> list[tuple[str, str]]:
+        return [tuple(booking) for booking in self._status['bookings']]
+
+    def clock_out_options(self) -> dict[str, Optional[str]]:
+        raise RuntimeError("Planning is not available through the daemon")
+
+    def plan_week(self, *_args) -> None:
+        raise RuntimeError("Planning is not available through the daemon")
+
+    def schedule_booking(self, *_args, **_kwargs) -> None:
+        raise RuntimeError("Scheduled bookings are not available through the daemon")
+
+    @property
+    def scheduled_booking(self) -> None:
+        return None
+
+    def cancel_scheduled_booking(self) -> None:
+        pass
+
+    def as_dict(self) -> dict:
+        return self._status
@@ -0,0 +1,27 @@
+import hmac
+import secrets
+from typing import Optional
+
+from work_clock.cache import JsonCache
+
+
+class DaemonToken:
+    # a new random secret for every daemon run, stored in a file only the user can read,
+    # so that neither other users nor web pages in the browser can talk to the daemon
+    def __init__(self, cache: Optional[JsonCache] = None):
+        self._cache = cache if cache is not None else JsonCache('daemon_token.json', private=True)
+
+    def create(self) -> str:
+        token = secrets.token_urlsafe(32)
+        self._cache.save({'token': token})
+        return token
+
+    def load(self) -> Optional[str]:
+        return self._cache.load().get('token')
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    @staticmethod
+    def matches(token: str, header: Optional[str]) -> bool:
+        return header is not None and hmac.compare_digest(header.encode(), f'Bearer {token}'.encode())
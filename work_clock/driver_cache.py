@@ -0,0 +1,41 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from work_clock.cache import JsonCache
+from work_clock.settings import DriverType
+
+
+@dataclass
+class CachedDriver:
+    driver_path: str
+    browser_path: str
+    browser_version: str
+
+
+class DriverCache:
+    # remembers where Selenium Manager found the driver and browser binaries,
+    # so that later launches can skip the resolution step entirely
+    def __init__(self, cache: Optional[JsonCache] = None):
+        self._cache = cache if cache is not None else JsonCache('driver_cache.json')
+
+    def lookup(self, driver_type: DriverType) -> Optional[CachedDriver]:
+        entry = self._cache.load().get(driver_type.name)
+        if entry is None:
+            return None
+        cached = CachedDriver(**entry)
+        if not Path(cached.driver_path).is_file():
+            self.invalidate(driver_type)
+            return None
+        return cached
+
+    def store(self, driver_type: DriverType, cached: CachedDriver) -> None:
+        entry = {
+            'driver_path': cached.driver_path,
+            'browser_path': cached.browser_path,
+            'browser_version': cached.browser_version,
+        }
+        self._cache.update(lambda data: data.update({driver_type.name: entry}))
+
+    def invalidate(self, driver_type: DriverType) -> None:
+        self._cache.update(lambda data: data.pop(driver_type.name, None))
@@ -1,27 +1,89 @@
 import asyncio
 import datetime
+import hashlib
+import json
 import logging
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from functools import wraps
 from http import HTTPStatus
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Iterator, Optional
 
 import requests
 from selenium import webdriver
+from selenium.common import WebDriverException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import wait, expected_conditions
 
+from work_clock.browser_processes import BrowserProcesses
+from work_clock.driver_cache import DriverCache, CachedDriver
+from work_clock.launch_stats import LaunchStats
+from work_clock.navigation import NavigationCache, NavigationUrls, find_profile_path
+from work_clock.remote_pool import REMOTE_POOL
+from work_clock.saldo_cache import SaldoCache
+from work_clock.resilience import RetryPolicy, AttemptOutcome
+from work_clock.session_store import SessionStore
 from work_clock.settings import SETTINGS, DriverType
-from work_clock.time_evaluation import TimeBookingList, BookingTime
+from work_clock.time_evaluation import TimeBookingList, BookingTime, normalize_bookings
 
 
 SELENIUM_TIMEOUT = 5  # in seconds
 
+JOURNAL_HEADER_SELECTOR = 'th.iflxQujouHdr'
+JOURNAL_CELL_SELECTOR = ('td.iflxQujouTab1, td.iflxQujouTabTime1, td.iflxQujouTabAccount1, '
+                         'td.iflxQujouTab2, td.iflxQujouTabTime2, td.iflxQujouTabAccount2')
+SALDO_HEADER_SELECTOR = 'th.iflxHomeInfoAcc'
+SALDO_CELL_SELECTOR = 'td.iflxHomeInfoAcc'
+BOOKING_BUTTON_CLASS = 'iflxButtonFinder'
+
+# Loads the home and the booking page at the same time with the session of the browser
+# and returns the texts of all relevant elements, so both server render times overlap.
+PARALLEL_FETCH_SCRIPT = """
+const [bookingUrl, mainUrl, homeUrl, selectors, done] = arguments;
+const load = async (url) => {
+    const response = await fetch(url, {credentials: 'include'});
+    return new DOMParser().parseFromString(await response.text(), 'text/html');
+};
+const text = (element) => element.textContent.replace(/\\s+/g, ' ').trim();
+const texts = (doc, selector) => Array.from(doc.querySelectorAll(selector), text);
+const cells = (doc, selector) => Array.from(
+    doc.querySelectorAll(selector), (cell) => [text(cell), cell.getAttribute('colspan')]);
+(async () => {
+    await load(bookingUrl);
+    await load(mainUrl);
+    // the home page is skipped (null), if the saldo of today is already known
+    const [home, booking] = await Promise.all([homeUrl ? load(homeUrl) : null, load(bookingUrl)]);
+    const button = booking.querySelector('.' + selectors.button);
+    return {
+        saldo_headers: home ? texts(home, selectors.saldo_headers) : [],
+        saldo_cells: home ? texts(home, selectors.saldo_cells) : [],
+        journal_headers: texts(booking, selectors.journal_headers),
+        journal_cells: cells(booking, selectors.journal_cells),
+        button: button === null ? null : text(button),
+    };
+})().then(done, (error) => done({error: String(error)}));
+"""
+
 INDEX_URL = SETTINGS.base_url + 'index.jsp'
 LOGIN_URL = SETTINGS.base_url + 'iflx/pin.jsp'
-MAIN_URL = SETTINGS.base_url + 'iflx/profile_187001/main.jsp'
-HOME_URL = SETTINGS.base_url + 'iflx/profile_187001/home.jsp'
-MENUE_URL = SETTINGS.base_url + 'iflx/profile_187001/menue.jsp'
-BOOKING_URL = SETTINGS.base_url + 'iflx/profile_187001/bookingsmain.jsp'
+# all other pages are below a profile path that differs between installations, see NavigationUrls
+
+# options class, service class, driver class and headless argument per driver type
+DRIVER_CLASSES = {
+    DriverType.edge: (webdriver.EdgeOptions, webdriver.EdgeService, webdriver.Edge, '--headless'),
+    DriverType.firefox: (webdriver.FirefoxOptions, webdriver.FirefoxService, webdriver.Firefox, '-headless'),
+    DriverType.chrome: (webdriver.ChromeOptions, webdriver.ChromeService, webdriver.Chrome, '--headless'),
+}
+
+
+@dataclass
+class StatusSnapshot:
+    saldo: Optional[BookingTime]
+    clocked_in: bool
+    bookings: TimeBookingList  # without a still open booking
+    open_since: Optional[BookingTime] = None
+    fingerprint: str = ''  # of the raw pages, equal fingerprints mean equal snapshots
 
 
 def only_in_context(function: Callable) -> Callable:
@@ -35,25 +97,53 @@ def only_in_context(function: Callable) -> Callable:
 
 
 class SeleniumTimeBooker:
-    def __init__(self, employee_id: int, employee_pin: int, debug=False):
+    def __init__(self, employee_id: int, employee_pin: int, debug=False, reuse_session=False,
+                 retry_policy: Optional[RetryPolicy] = None):
         self.employee_id = employee_id
         self.employee_pin = employee_pin
         self.debug_mode = debug
+        self.reuse_session = reuse_session
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.attempts: list[AttemptOutcome] = []
+        self._processes = BrowserProcesses()
+        self._driver_cache = DriverCache()
+        self._launch_stats = LaunchStats()
+        self._saldo_cache = SaldoCache()
+        self._navigation_cache = NavigationCache()
+        self._session_store = SessionStore()
+        self.urls = NavigationUrls(SETTINGS.base_url)
         self.driver = None
+        self._armed_button = None
+        self._unverified_urls = False  # cached URLs, that were not yet used after a login
         self._context_active: bool = False
 
     def __enter__(self):
         if self._context_active:
             raise RuntimeError("Only open one context at a time!")
         self._context_active = True
-        asyncio.run(self._init_driver())
-        asyncio.run(self._login())
+        self.urls = self._navigation_cache.lookup(SETTINGS.base_url) or NavigationUrls(SETTINGS.base_url)
+        self._unverified_urls = False
+        try:
+            asyncio.run(self._init_driver())
+            if not (self.reuse_session and asyncio.run(self._restore_session())):
+                asyncio.run(self._login())
+        except BaseException:
+            # __exit__ is not called for a failed __enter__, so clean up here
+            self._close()
+            self._context_active = False
+            raise
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb) -> None:
-        asyncio.run(self._logout())
-        self._close()
-        self._context_active = False
+        try:
+            if self.reuse_session:
+                # keep the server session alive for the next run instead of logging out
+                self._store_session()
+            else:
+                asyncio.run(self._logout())
+        finally:
+            self._close()
+            self._context_active = False
 
     @staticmethod
     def service_is_reachable() -> bool:
@@ -68,8 +158,31 @@ class SeleniumTimeBooker:
         asyncio.run(self._click_booking_button())
 
     @only_in_context
-    def hour_saldo(self) -> Optional[BookingTime]:
-        return asyncio.run(self._get_hour_saldo())
+    def arm_booking_button(self) -> bool:
+        # locate the booking button ahead of time, so that the later click is the only request,
+        # returns if the user is clocked in right now
+        return asyncio.run(self._arm_booking_button())
+
+    @only_in_context
+    def click_armed_button(self) -> None:
+        if self._armed_button is None:
+            raise RuntimeError("Please arm the booking button first")
+        button, self._armed_button = self._armed_button, None
+        try:
+            button.click()
+        except WebDriverException as error:
+            # e.g. the page was reloaded in the meantime, so take the slow way
+            logging.warning("Armed booking button failed, clicking it again: %s", repr(error))
+            asyncio.run(self._click_booking_button())
+
+    @only_in_context
+    def hour_saldo(self, refresh: bool = False) -> Optional[BookingTime]:
+        # the saldo up to yesterday changes at most once a day, so the home page is only loaded once a day
+        saldo = None if refresh else self._cached_saldo()
+        if saldo is None:
+            saldo = asyncio.run(self._get_hour_saldo())
+            self._store_saldo(saldo)
+        return saldo
 
     @only_in_context
     def user_is_logged_in(self) -> bool:
@@ -82,53 +195,298 @@ class SeleniumTimeBooker:
         bookings = self._table_to_booking_list(table=table)
         return bookings
 
+    @only_in_context
+    def today_journal(self) -> tuple[TimeBookingList, Optional[BookingTime]]:
+        # the closed bookings of today and the start of a still open booking
+        table = asyncio.run(self._journal_table())
+        bookings = self._table_to_booking_list(table=table, include_open=False, normalize=True)
+        return bookings, self._open_booking_start(table)
+
+    @only_in_context
+    def status_snapshot(self, refresh_saldo: bool = False, parallel: bool = True,
+                        previous: Optional[StatusSnapshot] = None) -> StatusSnapshot:
+        # the pages are only parsed, if they differ from the ones of the previous snapshot
+        saldo = None if refresh_saldo else self._cached_saldo()
+        if parallel:
+            fetched_saldo, button_text, table = asyncio.run(self._fetch_status_parallel(load_home=saldo is None))
+        else:
+            fetched_saldo = asyncio.run(self._get_hour_saldo()) if saldo is None else None
+            button_text, table = asyncio.run(self._read_booking_page())
+        if saldo is None:
+            saldo = fetched_saldo
+            self._store_saldo(saldo)
+        fingerprint = self._fingerprint(saldo, button_text, table)
+        if previous is not None and previous.fingerprint == fingerprint:
+            logging.info("Nothing changed since the last update")
+            return previous
+        return StatusSnapshot(
+            saldo=saldo,
+            clocked_in=self._button_to_state(button_text),
+            bookings=self._table_to_booking_list(table=table, include_open=False, normalize=True),
+            open_since=self._open_booking_start(table),
+            fingerprint=fingerprint,
+        )
+
+    @staticmethod
+    def _fingerprint(saldo: Optional[BookingTime], button_text: str, table: list[list[str]]) -> str:
+        # the bookings of today depend on the date, so the same journal differs after midnight
+        raw = json.dumps([datetime.date.today().isoformat(), str(saldo), button_text.strip(), table])
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _cached_saldo(self) -> Optional[BookingTime]:
+        return self._saldo_cache.lookup(SETTINGS.base_url, self.employee_id)
+
+    def _store_saldo(self, saldo: Optional[BookingTime]) -> None:
+        if saldo is not None:
+            self._saldo_cache.store(SETTINGS.base_url, self.employee_id, saldo)
+
     async def _init_driver(self):
-        match SETTINGS.webdriver:
-            case DriverType.edge:
-                options = webdriver.EdgeOptions()
-                if not self.debug_mode:
-                    options.add_argument('--headless')
-                self.driver = webdriver.Edge(options=options)
-            case DriverType.firefox:
-                options = webdriver.FirefoxOptions()
-                if not self.debug_mode:
-                    options.add_argument('-headless')
-                self.driver = webdriver.Firefox(options=options)
-            case DriverType.chrome:
-                options = webdriver.ChromeOptions()
-                if not self.debug_mode:
-                    options.add_argument('--headless')
-                self.driver = webdriver.Chrome(options=options)
-            case _:
-                raise NotImplementedError(f"Webdriver '{SETTINGS.webdriver}' is not implemented")
+        candidates = SETTINGS.hedged_drivers
+        if len(candidates) > 1:
+            self.driver = self._launch_hedged(candidates)
+        else:
+            self.driver = self._timed_launch(SETTINGS.webdriver)
+        self._processes.track(self.driver)
+        self._processes.log_resident_memory()
+
+    def _timed_launch(self, driver_type: DriverType) -> webdriver.Remote:
+        start = time.monotonic()
+        try:
+            driver = self._launch_driver(driver_type)
+        except Exception:
+            self._launch_stats.record(driver_type, time.monotonic() - start, success=False)
+            raise
+        self._launch_stats.record(driver_type, time.monotonic() - start)
+        return driver
+
+    def _launch_hedged(self, candidates: list[DriverType]) -> webdriver.Remote:
+        # start all candidates at once and keep the first one that shows the login page,
+        # logging in is left to the winner, otherwise every browser would open a server session
+        logging.info("Launching %s at the same time", ', '.join(driver_type.name for driver_type in candidates))
+        start = time.monotonic()
+
+        def launch_until_ready(driver_type: DriverType) -> tuple[DriverType, webdriver.Remote]:
+            driver = self._timed_launch(driver_type)
+            try:
+                driver.get(LOGIN_URL)
+            except WebDriverException:
+                self._quit_quietly(driver_type, driver)
+                raise
+            return driver_type, driver
+
+        executor = ThreadPoolExecutor(max_workers=len(candidates), thread_name_prefix='hedged_launch')
+        futures = [executor.submit(launch_until_ready, driver_type)
+                   for driver_type in self._launch_stats.ranked(candidates)]
+        winner: Optional[webdriver.Remote] = None
+        errors = []
+        try:
+            for future in as_completed(futures):
+                if future.exception() is not None:
+                    errors.append(future.exception())
+                    continue
+                driver_type, winner = future.result()
+                logging.info("Using %s, ready after %.1f s", driver_type.name, time.monotonic() - start)
+                break
+        finally:
+            def discard(future: Future) -> None:
+                if future.exception() is None and future.result()[1] is not winner:
+                    self._quit_quietly(*future.result())
+
+            # the slower browsers are shut down as soon as they are up
+            for future in futures:
+                future.add_done_callback(discard)
+            executor.shutdown(wait=False)
+        if winner is None:
+            raise errors[0]
+        return winner
+
+    @staticmethod
+    def _quit_quietly(driver_type: DriverType, driver: webdriver.Remote) -> None:
+        logging.info("Shutting down the %s browser", driver_type.name)
+        if REMOTE_POOL.owns(driver):
+            REMOTE_POOL.release(driver)
+            return
+        try:
+            driver.quit()
+        except WebDriverException as error:
+            logging.warning("Could not quit the %s driver: %s", driver_type.name, repr(error))
+
+    def _launch_driver(self, driver_type: DriverType) -> webdriver.Remote:
+        if driver_type is DriverType.remote:
+            return self._connect_remote()
+        if driver_type not in DRIVER_CLASSES:
+            raise NotImplementedError(f"Webdriver '{driver_type}' is not implemented")
+        _, service_class, driver_class, _ = DRIVER_CLASSES[driver_type]
+        driver_cache = self._driver_cache
+        cached = driver_cache.lookup(driver_type)
+        if cached is not None:
+            logging.info("Using cached driver binary '%s'", cached.driver_path)
+            try:
+                driver = driver_class(
+                    options=self._driver_options(driver_type, browser_path=cached.browser_path),
+                    service=service_class(executable_path=cached.driver_path),
+                )
+            except WebDriverException as error:
+                logging.info("Cached driver failed to start, resolving it again: %s", repr(error))
+                driver_cache.invalidate(driver_type)
+            else:
+                if driver.capabilities.get('browserVersion') != cached.browser_version:
+                    # the browser was updated, so resolve the matching driver on the next launch
+                    driver_cache.invalidate(driver_type)
+                return driver
+        # no usable cache entry, let Selenium Manager resolve the binaries
+        options = self._driver_options(driver_type)
+        driver = driver_class(options=options)
+        driver_cache.store(driver_type, CachedDriver(
+            driver_path=driver.service.path,
+            browser_path=options.binary_location,
+            browser_version=driver.capabilities.get('browserVersion', ''),
+        ))
+        return driver
+
+    def _connect_remote(self) -> webdriver.Remote:
+        # a pooled session of a grid node, no local browser is started
+        options = self._driver_options(SETTINGS.grid_browser)
+        return REMOTE_POOL.acquire(
+            SETTINGS.grid_endpoints,
+            lambda endpoint: webdriver.Remote(command_executor=endpoint, options=options),
+        )
+
+    def _driver_options(self, driver_type: DriverType, browser_path: str = '') -> Any:
+        options_class, _, _, headless_argument = DRIVER_CLASSES[driver_type]
+        options = options_class()
+        if not self.debug_mode:
+            options.add_argument(headless_argument)
+        if browser_path:
+            options.binary_location = browser_path
+        return options
 
     async def _login(self):
         logging.info("Logging in to the web interface")
-        self.driver.get(LOGIN_URL)
+        # e.g. a hedged launch or an expired session already show the login page
+        if not self._on_login_page():
+            await self._load(LOGIN_URL)
         employee_id_field = await self.__get_element_once_present(By.ID, 'InpEmpId')
         employee_id_field.send_keys(str(self.employee_id))
         employee_id_field = await self.__get_element_once_present(By.ID, 'InpEmpPwd')
         employee_id_field.send_keys(str(self.employee_pin))
         login_button = await self.__get_element_once_present(By.CLASS_NAME, 'iflxButtonFactoryTextContainerOuter')
         login_button.click()
+        if self._navigation_cache.lookup(SETTINGS.base_url) is None:
+            await self._discover_urls()
+        else:
+            self._unverified_urls = True
+
+    async def _rediscover_urls(self, url: str) -> str:
+        # the login worked, but a page of the cached profile path shows the login page,
+        # e.g. after a change of the tenant, so log in once more and look for the profile path
+        logging.warning("The cached profile path '%s' is not valid, discovering it again", self.urls.profile_path)
+        old_profile_url = self.urls.base_url + self.urls.profile_path
+        self._navigation_cache.invalidate(SETTINGS.base_url)
+        self.urls = NavigationUrls(SETTINGS.base_url)
+        await self._login()
+        return url.replace(old_profile_url, self.urls.base_url + self.urls.profile_path)
+
+    async def _discover_urls(self) -> None:
+        # the landing page after the login reveals the profile path, later sessions go straight to the pages
+        try:
+            wait.WebDriverWait(self.driver, SELENIUM_TIMEOUT).until(
+                lambda driver: not driver.current_url.startswith(LOGIN_URL))
+        except WebDriverException as error:
+            logging.warning("Login did not leave the login page: %r", error)
+            return
+        candidates = [self.driver.current_url] + [
+            element.get_attribute('src') or element.get_attribute('href')
+            for element in self.driver.find_elements(By.CSS_SELECTOR, 'frame, iframe, a')
+        ]
+        profile_path = find_profile_path(candidates)
+        if profile_path is None:
+            logging.warning("No profile path found after the login, using '%s'", self.urls.profile_path)
+            return
+        logging.info("Discovered the profile path '%s'", profile_path)
+        self.urls = NavigationUrls(SETTINGS.base_url, profile_path)
+        self._navigation_cache.store(self.urls)
+
+    async def _restore_session(self) -> bool:
+        cookies = self._session_store.load(SETTINGS.base_url, self.employee_id)
+        if not cookies:
+            return False
+        logging.info("Restoring the previous session")
+        # cookies can only be set for the domain that is currently open
+        await self._load(INDEX_URL)
+        try:
+            for cookie in cookies:
+                self.driver.add_cookie(cookie)
+            await self._load(self.urls.main)
+        except WebDriverException as error:
+            # e.g. cookies of another domain, they would fail the same way in every later run
+            logging.warning("Could not restore the previous session: %r", error)
+            self._session_store.clear(SETTINGS.base_url, self.employee_id)
+            return False
+        if self._on_login_page():
+            logging.info("Previous session has expired")
+            self._session_store.clear(SETTINGS.base_url, self.employee_id)
+            return False
+        return True
+
+    def _on_login_page(self) -> bool:
+        return self.driver.current_url.startswith(LOGIN_URL) or len(self.driver.find_elements(By.ID, 'InpEmpId')) > 0
+
+    def _store_session(self):
+        self._session_store.save(SETTINGS.base_url, self.employee_id, self.driver.get_cookies())
+
+    async def _retry(self, step: str, action: Callable[[], Any]) -> Any:
+        # repeat only the failed step, the session itself stays alive in between
+        max_attempts = self.retry_policy.max_attempts
+        for attempt in range(1, max_attempts + 1):
+            start = time.monotonic()
+            try:
+                result = action()
+            except WebDriverException as error:
+                self.attempts.append(AttemptOutcome(step=step, attempt=attempt, success=False,
+                                                    duration=time.monotonic() - start, error=repr(error)))
+                if attempt == max_attempts:
+                    raise
+                delay = self.retry_policy.delay(attempt)
+                logging.warning("Step '%s' failed (attempt %d/%d), retrying in %.1f s: %s",
+                                step, attempt, max_attempts, delay, repr(error))
+                await asyncio.sleep(delay)
+            else:
+                self.attempts.append(AttemptOutcome(step=step, attempt=attempt, success=True,
+                                                    duration=time.monotonic() - start))
+                return result
+        raise RuntimeError("Retry policy needs at least one attempt")
+
+    async def _load(self, url: str) -> None:
+        await self._retry(f"load {url}", lambda: self.driver.get(url))
+        # the first page of cached URLs after the login tells, if they are still valid
+        if self._unverified_urls and url.startswith(self.urls.base_url + self.urls.profile_path):
+            self._unverified_urls = False
+            if self._on_login_page():
+                url = await self._rediscover_urls(url)
+                await self._retry(f"load {url}", lambda: self.driver.get(url))
 
     async def __get_element_once_present(self, by: str, value: str, multiple: bool = False) -> Any:
-        logging.info(f"Waiting for {repr(by)} = '{value}' to be present")
+        logging.info("Waiting for %r = '%s' to be present", by, value)
         locator = (by, value)
         await asyncio.sleep(0.01)  # minimum wait time
-        wait.WebDriverWait(self.driver, SELENIUM_TIMEOUT).until(
-            expected_conditions.presence_of_element_located(locator))
+        await self._retry(f"wait for {value}", lambda: wait.WebDriverWait(self.driver, SELENIUM_TIMEOUT).until(
+            expected_conditions.presence_of_element_located(locator)))
         if multiple:
             return self.driver.find_elements(by, value)
         return self.driver.find_element(by, value)
 
     async def _is_logged_in(self) -> bool:
         logging.info("Check, if user is logged in")
-        self.driver.get(BOOKING_URL)
-        self.driver.get(MAIN_URL)
-        self.driver.get(BOOKING_URL)
-        booking_button = await self.__get_element_once_present(By.CLASS_NAME, 'iflxButtonFinder')
-        button_text = booking_button.text.strip()
+        await self._load(self.urls.booking)
+        await self._load(self.urls.main)
+        await self._load(self.urls.booking)
+        booking_button = await self.__get_element_once_present(By.CLASS_NAME, BOOKING_BUTTON_CLASS)
+        return self._button_to_state(booking_button.text)
+
+    @staticmethod
+    def _button_to_state(button_text: str) -> bool:
+        button_text = button_text.strip()
         if button_text == 'Kommen':
             return False
         if button_text == 'Gehen':
@@ -137,54 +495,102 @@ class SeleniumTimeBooker:
 
     async def _click_booking_button(self):
         logging.info("Toggle the booking button")
-        self.driver.get(BOOKING_URL)
-        self.driver.get(MAIN_URL)
-        self.driver.get(BOOKING_URL)
+        await self._load(self.urls.booking)
+        await self._load(self.urls.main)
+        await self._load(self.urls.booking)
         booking_button = await self.__get_element_once_present(By.CLASS_NAME, 'iflxButtonFactoryTextContainerNormal')
         booking_button.click()
 
+    async def _arm_booking_button(self) -> bool:
+        logging.info("Arm the booking button")
+        await self._load(self.urls.booking)
+        await self._load(self.urls.main)
+        await self._load(self.urls.booking)
+        state_button = await self.__get_element_once_present(By.CLASS_NAME, BOOKING_BUTTON_CLASS)
+        self._armed_button = await self.__get_element_once_present(
+            By.CLASS_NAME, 'iflxButtonFactoryTextContainerNormal')
+        return self._button_to_state(state_button.text)
+
+    async def _read_booking_page(self) -> tuple[str, list[list[str]]]:
+        # the text of the booking button and the journal with a single visit of the booking page
+        table = await self._journal_table()
+        booking_button = await self.__get_element_once_present(By.CLASS_NAME, BOOKING_BUTTON_CLASS)
+        return booking_button.text, table
+
     async def _journal_table(self) -> list[list[str]]:
-        self.driver.get(BOOKING_URL)
-        self.driver.get(MAIN_URL)
-        self.driver.get(BOOKING_URL)
+        await self._load(self.urls.booking)
+        await self._load(self.urls.main)
+        await self._load(self.urls.booking)
         table_headers = await self.__get_element_once_present(
-            By.CSS_SELECTOR, 'th.iflxQujouHdr', multiple=True)
+            By.CSS_SELECTOR, JOURNAL_HEADER_SELECTOR, multiple=True)
         table_cells = await self.__get_element_once_present(
-            By.CSS_SELECTOR,
-            ('td.iflxQujouTab1, td.iflxQujouTabTime1, td.iflxQujouTabAccount1, '
-             'td.iflxQujouTab2, td.iflxQujouTabTime2, td.iflxQujouTabAccount2'),
-            multiple=True,
+            By.CSS_SELECTOR, JOURNAL_CELL_SELECTOR, multiple=True)
+        return self._expand_table(
+            headers=[th.text for th in table_headers],
+            cells=[(cell.text, cell.get_attribute('colspan')) for cell in table_cells],
         )
-        cells_per_row = len(table_headers)
-        colspans = [cell.get_attribute('colspan') for cell in table_cells]
-        n_cells = sum(int(colspan) if colspan is not None else 1 for colspan in colspans)
+
+    @staticmethod
+    def _expand_table(headers: list[str], cells: list[tuple[str, Optional[str]]]) -> list[list[str]]:
+        cells_per_row = len(headers)
+        n_cells = sum(int(colspan) if colspan is not None else 1 for _, colspan in cells)
         assert n_cells % cells_per_row == 0
-        table = [[th.text for th in table_headers]]
+        table = [list(headers)]
         table_row = []
-        for cell in table_cells:
-            colspan = 1 if cell.get_attribute('colspan') is None else cell.get_attribute('colspan')
-            for _ in range(int(colspan)):
-                table_row.append(cell.text)
+        for text, colspan in cells:
+            for _ in range(1 if colspan is None else int(colspan)):
+                table_row.append(text)
             if len(table_row) >= cells_per_row:
                 table.append(table_row)
                 table_row = []
         return table
 
     async def _get_hour_saldo(self) -> Optional[BookingTime]:
-        self.driver.get(HOME_URL)
+        await self._load(self.urls.home)
         table_headers = await self.__get_element_once_present(
-            By.CSS_SELECTOR, 'th.iflxHomeInfoAcc', multiple=True)
+            By.CSS_SELECTOR, SALDO_HEADER_SELECTOR, multiple=True)
         table_cells = await self.__get_element_once_present(
-            By.CSS_SELECTOR, 'td.iflxHomeInfoAcc', multiple=True)
-        for header, data in zip(table_headers, table_cells):
-            if header.text.strip() == 'Gleitzeit':
-                time_as_str = data.text.strip().replace(',', ':')
+            By.CSS_SELECTOR, SALDO_CELL_SELECTOR, multiple=True)
+        return self._saldo_from_table(
+            headers=[header.text for header in table_headers],
+            cells=[data.text for data in table_cells],
+        )
+
+    @staticmethod
+    def _saldo_from_table(headers: list[str], cells: list[str]) -> Optional[BookingTime]:
+        for header, data in zip(headers, cells):
+            if header.strip() == 'Gleitzeit':
+                time_as_str = data.strip().replace(',', ':')
                 return BookingTime.from_string(time_as_str)
         return None
 
+    async def _fetch_status_parallel(self, load_home: bool = True
+                                     ) -> tuple[Optional[BookingTime], str, list[list[str]]]:
+        logging.info("Fetching the booking page%s in parallel", " and the home page" if load_home else "")
+        self.driver.set_script_timeout(2 * SELENIUM_TIMEOUT)
+        selectors = {
+            'saldo_headers': SALDO_HEADER_SELECTOR,
+            'saldo_cells': SALDO_CELL_SELECTOR,
+            'journal_headers': JOURNAL_HEADER_SELECTOR,
+            'journal_cells': JOURNAL_CELL_SELECTOR,
+            'button': BOOKING_BUTTON_CLASS,
+        }
+        result = await self._retry("parallel fetch", lambda: self.driver.execute_async_script(
+            PARALLEL_FETCH_SCRIPT, self.urls.booking, self.urls.main, self.urls.home if load_home else None,
+            selectors))
+        if 'error' in result:
+            raise RuntimeError(f"Parallel fetch failed: {result['error']}")
+        if result['button'] is None:
+            raise RuntimeError("Booking button not found on the booking page")
+        table = self._expand_table(
+            headers=result['journal_headers'],
+            cells=[tuple(cell) for cell in result['journal_cells']],
+        )
+        saldo = self._saldo_from_table(headers=result['saldo_headers'], cells=result['saldo_cells'])
+        return saldo, result['button'], table
+
     @staticmethod
-    def _table_to_booking_list(table: list[list[str]]) -> TimeBookingList:
-        time_booking_list = []
+    def _today_rows(table: list[list[str]]) -> Iterator[tuple[str, str]]:
         current_day_str = datetime.datetime.today().strftime("%d.%m.")
         on_current_day = False
         for row in table:
@@ -196,17 +602,51 @@ class SeleniumTimeBooker:
             out_time_str = row[3]
             if in_time_str.strip() == '':
                 continue
+            yield in_time_str, out_time_str
+
+    @staticmethod
+    def _table_to_booking_list(table: list[list[str]], include_open: bool = True,
+                               normalize: bool = False) -> TimeBookingList:
+        time_booking_list = []
+        for in_time_str, out_time_str in SeleniumTimeBooker._today_rows(table):
             if out_time_str.strip() == '':
+                if not include_open:
+                    continue
                 out_time_str = datetime.datetime.now().strftime("%H:%M")
             booking = (BookingTime.from_string(in_time_str), BookingTime.from_string(out_time_str))
             time_booking_list.append(booking)
+        if normalize:
+            # corrections and duplicate punches in the journal would otherwise be counted twice
+            return normalize_bookings(time_booking_list)
         return time_booking_list
 
+    @staticmethod
+    def _open_booking_start(table: list[list[str]]) -> Optional[BookingTime]:
+        open_since = None
+        for in_time_str, out_time_str in SeleniumTimeBooker._today_rows(table):
+            if out_time_str.strip() == '':
+                open_since = BookingTime.from_string(in_time_str)
+        return open_since
+
     async def _logout(self):
         logging.info("Log out from the web interface")
-        self.driver.get(MENUE_URL)
+        await self._load(self.urls.menue)
         logout_button = await self.__get_element_once_present(By.CLASS_NAME, 'iflxMenu3ExitButton')
         logout_button.click()
 
     def _close(self):
-        self.driver.close()
+        if self.driver is None:
+            return
+        try:
+            self._processes.log_resident_memory()
+            if REMOTE_POOL.owns(self.driver):
+                # the session stays open on the grid for the next booker
+                REMOTE_POOL.release(self.driver)
+            else:
+                # quit() ends the driver session and the processes, close() would only close the window
+                self.driver.quit()
+        except WebDriverException as error:
+            logging.warning("Could not quit the driver: %s", repr(error))
+        finally:
+            self._processes.release()
+            self.driver = None
@@ -0,0 +1,57 @@
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from work_clock.cache import JsonCache
+from work_clock.settings import DriverType
+
+
+SMOOTHING = 0.3  # weight of the newest launch in the moving average
+
+
+@dataclass
+class LaunchLatency:
+    launches: int = 0
+    failures: int = 0
+    average_seconds: Optional[float] = None  # exponential moving average of the successful launches
+    last_seconds: Optional[float] = None
+
+
+class LaunchStats:
+    # launch latencies per driver type on this machine, to know which browser starts the fastest
+    def __init__(self, cache: Optional[JsonCache] = None):
+        self._cache = cache if cache is not None else JsonCache('launch_latencies.json')
+
+    def record(self, driver_type: DriverType, seconds: float, success: bool = True) -> None:
+        def change(data: dict) -> None:
+            latency = LaunchLatency(**data.get(driver_type.name, {}))
+            latency.launches += 1
+            if not success:
+                latency.failures += 1
+            else:
+                latency.last_seconds = round(seconds, 3)
+                if latency.average_seconds is None:
+                    latency.average_seconds = latency.last_seconds
+                else:
+                    latency.average_seconds = round(
+                        SMOOTHING * seconds + (1 - SMOOTHING) * latency.average_seconds, 3)
+            data[driver_type.name] = latency.__dict__
+
+        self._cache.update(change)
+
+    def latency(self, driver_type: DriverType) -> LaunchLatency:
+        return LaunchLatency(**self._cache.load().get(driver_type.name, {}))
+
+    def ranked(self, candidates: Optional[Iterable[DriverType]] = None) -> list[DriverType]:
+        # fastest first, drivers without a successful launch last
+        candidates = list(DriverType) if candidates is None else list(candidates)
+
+        def key(driver_type: DriverType) -> tuple[bool, float]:
+            average = self.latency(driver_type).average_seconds
+            return average is None, average if average is not None else 0.0
+
+        return sorted(candidates, key=key)
+
+    def preferred(self, candidates: Optional[Iterable[DriverType]] = None) -> Optional[DriverType]:
+        ranked = [driver_type for driver_type in self.ranked(candidates)
+                  if self.latency(driver_type).average_seconds is not None]
+        return ranked[0] if ranked else None
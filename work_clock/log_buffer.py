@@ -0,0 +1,58 @@
+import logging
+import sys
+import threading
+from collections import deque
+from typing import Optional
+
+
+LOG_FORMAT = "%(asctime)s  %(levelname)-8s %(funcName)35s():  %(message)s"
+LOG_CAPACITY = 2000  # records
+
+
+class RingBufferHandler(logging.Handler):
+    # keeps the most recent records in memory, e.g. for the log viewer of the GUI build without a console;
+    # records are only formatted when they are read, so emitting costs no formatting and no I/O
+    def __init__(self, capacity: int = LOG_CAPACITY, level: int = logging.NOTSET):
+        super().__init__(level)
+        self._records: deque[tuple[int, logging.LogRecord]] = deque(maxlen=capacity)
+        self._sequence = 0
+        self._buffer_lock = threading.Lock()
+        self.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    def emit(self, record: logging.LogRecord) -> None:
+        with self._buffer_lock:
+            self._sequence += 1
+            self._records.append((self._sequence, record))
+
+    @property
+    def last_sequence(self) -> int:
+        return self._sequence
+
+    def records_since(self, sequence: int = 0) -> list[tuple[int, logging.LogRecord]]:
+        with self._buffer_lock:
+            return [(number, record) for number, record in self._records if number > sequence]
+
+    def lines_since(self, sequence: int = 0, level: int = logging.NOTSET) -> tuple[int, list[str]]:
+        # the formatted records after the given sequence number and the number to continue from
+        records = self.records_since(sequence)
+        last = records[-1][0] if records else sequence
+        return last, [self.format(record) for _, record in records if record.levelno >= level]
+
+    def clear(self) -> None:
+        with self._buffer_lock:
+            self._records.clear()
+
+
+LOG_BUFFER = RingBufferHandler()
+
+
+def setup_logging(level: int, console: Optional[bool] = None) -> None:
+    # the buffer always records, the console only if there is one (not in the frozen GUI build)
+    handlers: list[logging.Handler] = [LOG_BUFFER]
+    if console is None:
+        console = sys.stderr is not None
+    if console:
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        handlers.append(console_handler)
+    logging.basicConfig(level=level, handlers=handlers)
@@ -1,49 +1,203 @@
 import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import fields
 from datetime import datetime
-from typing import Optional
+from typing import Any, Callable, Iterator, Optional
 
-from work_clock.interflex_requests import SeleniumTimeBooker
+from work_clock.browser_processes import BrowserProcesses
+from work_clock.interflex_requests import SeleniumTimeBooker, StatusSnapshot
+from work_clock.planner import Planner, WeekPlan
+from work_clock.resilience import AttemptOutcome, CircuitBreaker, CircuitState
+from work_clock.scheduled_booking import ScheduledBooking, ARM_LEAD_TIME
 from work_clock.settings import SETTINGS
+from work_clock.single_flight import SingleFlight
 from work_clock.time_evaluation import DailyBookings, BookingTime
 
 
+# changed field -> (old value, new value)
+StatusChanges = dict[str, tuple[Any, Any]]
+
+
 class ClockState:
-    def __init__(self):
+    def __init__(self, keep_session_warm: bool = False):
+        self._keep_session_warm = keep_session_warm
+        self._warm_booker: Optional[SeleniumTimeBooker] = None
+        self._circuit_breaker = CircuitBreaker()
+        self._last_attempts: list[AttemptOutcome] = []
+        self._flights = SingleFlight()
+        # earlier runs might have crashed before their browsers were shut down
+        BrowserProcesses().reap_orphans()
         self._vpn_connected: Optional[bool] = None
         self._saldo: Optional[BookingTime] = None
         self._clocked_in: Optional[bool] = None
-        self._bookings: Optional[DailyBookings] = None
+        self._bookings: Optional[DailyBookings] = None  # closed bookings only
+        self._open_since: Optional[BookingTime] = None
+        self._live_bookings_cache: Optional[tuple[BookingTime, DailyBookings]] = None
         self._last_check: Optional[datetime] = None
+        self._scheduled_booking: Optional[ScheduledBooking] = None
+        self._snapshot: Optional[StatusSnapshot] = None
+        self._subscribers: list[Callable[[StatusChanges], None]] = []
 
-    def toggle_clock(self) -> None:
-        booker = SeleniumTimeBooker(
+    @staticmethod
+    def _new_booker() -> SeleniumTimeBooker:
+        return SeleniumTimeBooker(
             employee_id=SETTINGS.employee_id,
             employee_pin=SETTINGS.employee_pin,
             debug=SETTINGS.debug_mode,
+            reuse_session=SETTINGS.reuse_session,
         )
-        with booker as active_booker:
+
+    @contextmanager
+    def _session(self, dedicated: bool = False) -> Iterator[SeleniumTimeBooker]:
+        # a dedicated session is never shared with the warm one, e.g. to be held open while waiting
+        # stop spawning browsers, if Interflex failed repeatedly
+        self._circuit_breaker.check()
+        keep_warm = self._keep_session_warm and not dedicated
+        booker = self._warm_booker if self._warm_booker is not None and keep_warm else self._new_booker()
+        booker.attempts.clear()
+        try:
+            if not keep_warm:
+                with booker:
+                    yield booker
+            else:
+                if self._warm_booker is None:
+                    self._warm_booker = booker.__enter__()
+                yield booker
+        except Exception:
+            self._circuit_breaker.record_failure()
+            if keep_warm:
+                # the warm session is probably broken, start a fresh one next time
+                self.close()
+            raise
+        finally:
+            self._last_attempts = list(booker.attempts)
+        self._circuit_breaker.record_success()
+
+    def close(self) -> None:
+        if self._warm_booker is None:
+            return
+        booker, self._warm_booker = self._warm_booker, None
+        try:
+            booker.__exit__(None, None, None)
+        except Exception as error:
+            logging.warning("Caught error while closing the session: %s", repr(error))
+
+    def toggle_clock(self) -> None:
+        self._flights.do('toggle_clock', self._toggle_clock)
+        # the next update has to show the new state
+        self._flights.forget('update_status')
+
+    def _toggle_clock(self) -> None:
+        with self._session() as active_booker:
             active_booker.full_state_toggle()
 
-    def update_status(self) -> None:
+    def schedule_booking(self, target: datetime, clock_in: bool, lead_time: float = ARM_LEAD_TIME
+                         ) -> ScheduledBooking:
+        if self._scheduled_booking is not None and not self._scheduled_booking.done:
+            raise RuntimeError("Another booking is already scheduled")
+        if target.timestamp() <= time.time():
+            raise ValueError(f"The time {target:%H:%M} has already passed")
+        scheduled = ScheduledBooking(target, clock_in=clock_in, lead_time=lead_time)
+        self._scheduled_booking = scheduled
+        threading.Thread(target=self._run_scheduled_booking, args=(scheduled,), daemon=True).start()
+        return scheduled
+
+    def _run_scheduled_booking(self, scheduled: ScheduledBooking) -> None:
+        try:
+            if not scheduled.wait_until(scheduled.arm_timestamp):
+                return
+            with self._session(dedicated=True) as active_booker:
+                clocked_in = active_booker.arm_booking_button()
+                scheduled.armed_at = datetime.now()
+                logging.info("Booking button armed %.1f s ahead of the target",
+                             scheduled.target_timestamp - time.time())
+                if clocked_in == scheduled.clock_in:
+                    scheduled.skipped = True
+                    return
+                if not scheduled.wait_until(scheduled.target_timestamp):
+                    return
+                active_booker.click_armed_button()
+                scheduled.offset = time.time() - scheduled.target_timestamp
+            logging.info("Scheduled booking done %+.3f s from the target", scheduled.offset)
+            self._flights.forget('update_status')
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            logging.error("Scheduled booking failed: %s", repr(error))
+            scheduled.error = repr(error)
+        finally:
+            scheduled.finish()
+
+    @property
+    def scheduled_booking(self) -> Optional[ScheduledBooking]:
+        return self._scheduled_booking
+
+    def cancel_scheduled_booking(self) -> None:
+        if self._scheduled_booking is not None:
+            self._scheduled_booking.cancel()
+
+    def update_status(self, force: bool = False, refresh_saldo: bool = False) -> None:
+        # the saldo is read once a day, unless a refresh of it is asked for
+        if force or refresh_saldo:
+            self._flights.forget('update_status')
+        # join a running update or reuse one that has just finished
+        self._flights.do('update_status', lambda: self._update_status(refresh_saldo),
+                         fresh_for=SETTINGS.refresh_window)
+
+    def poll_status(self) -> None:
+        # nothing to fetch, the time of today is extrapolated from the last update on every read
+        pass
+
+    def _update_status(self, refresh_saldo: bool = False) -> None:
         # first check, if Interflex is reachable at all
+        vpn_connected = self._vpn_connected
         try:
             self._vpn_connected = SeleniumTimeBooker.service_is_reachable()
         except Exception as error:
-            logging.warning("Caught error: %s" % repr(error))
+            logging.warning("Caught error: %r", error)
             self._vpn_connected = None
+        if self._vpn_connected != vpn_connected:
+            self._publish({'vpn_connected': (vpn_connected, self._vpn_connected)})
+        if self._vpn_connected is None:
             return
         # if reachable, get all relevant information
-        booker = SeleniumTimeBooker(
-            employee_id=SETTINGS.employee_id,
-            employee_pin=SETTINGS.employee_pin,
-            debug=SETTINGS.debug_mode,
-        )
-        with booker as active_booker:
-            self._saldo = active_booker.hour_saldo()
-            self._clocked_in = active_booker.user_is_logged_in()
-            self._bookings = DailyBookings(active_booker.today_bookings(),
-                                           normal_hours_per_day=SETTINGS.hours_per_day)
+        with self._session() as active_booker:
+            snapshot = active_booker.status_snapshot(
+                refresh_saldo=refresh_saldo, parallel=SETTINGS.parallel_fetch, previous=self._snapshot)
         self._last_check = datetime.now()
+        hours_per_day = BookingTime.from_hour_float(SETTINGS.hours_per_day)
+        if snapshot is self._snapshot and self._bookings is not None and self._bookings.hours_per_day == hours_per_day:
+            # the same pages as last time, so everything derived from them is still valid
+            return
+        changes: StatusChanges = {}
+        for status_field in fields(StatusSnapshot):
+            if status_field.name == 'fingerprint':
+                continue
+            old = getattr(self._snapshot, status_field.name, None)
+            new = getattr(snapshot, status_field.name)
+            if old != new:
+                changes[status_field.name] = (old, new)
+        self._snapshot = snapshot
+        self._saldo = snapshot.saldo
+        self._clocked_in = snapshot.clocked_in
+        self._bookings = DailyBookings(snapshot.bookings, normal_hours_per_day=SETTINGS.hours_per_day)
+        self._open_since = snapshot.open_since
+        self._live_bookings_cache = None
+        if changes:
+            self._publish(changes)
+
+    def subscribe(self, callback: Callable[[StatusChanges], None]) -> Callable[[], None]:
+        # the callback gets the changed fields with their old and new values after each update
+        # that changed something, the returned function ends the subscription
+        self._subscribers.append(callback)
+        return lambda: self._subscribers.remove(callback)
+
+    def _publish(self, changes: StatusChanges) -> None:
+        for callback in list(self._subscribers):
+            try:
+                callback(changes)
+            except Exception as error:  # pylint: disable=broad-exception-caught
+                logging.warning("Subscriber failed to handle %s: %r", ', '.join(changes), error)
 
     @property
     def last_check(self) -> str:
@@ -59,24 +213,94 @@ class ClockState:
     def clocked_in(self) -> Optional[bool]:
         return self._clocked_in
 
+    def _live_bookings(self) -> Optional[DailyBookings]:
+        # while clocked in, the open booking is extrapolated to the current time without asking Interflex
+        if self._bookings is None or self._open_since is None:
+            return self._bookings
+        now = max(BookingTime.create_now(), self._open_since)
+        if self._live_bookings_cache is None or self._live_bookings_cache[0] != now:
+            live_bookings = DailyBookings(list(self._bookings), break_times=self._bookings.break_times,
+                                          normal_hours_per_day=SETTINGS.hours_per_day)
+            live_bookings.add(self._open_since, now)
+            self._live_bookings_cache = (now, live_bookings)
+        return self._live_bookings_cache[1]
+
     @property
     def saldo(self) -> Optional[str]:
         if self._saldo is None:
             return None
         if SETTINGS.today_in_saldo is True:
-            if self._bookings is None:
+            bookings = self._live_bookings()
+            if bookings is None:
                 return None
-            return str(self._saldo + self._bookings.daily_saldo)
+            return str(self._saldo + bookings.daily_saldo)
         return str(self._saldo)
 
     @property
     def time_today(self) -> Optional[str]:
-        if self._bookings is None or len(self._bookings) == 0:
+        bookings = self._live_bookings()
+        if bookings is None or len(bookings) == 0:
             return None
-        return str(self._bookings.total)
+        return str(bookings.total)
 
     @property
     def done_today(self) -> Optional[str]:
-        if self._bookings is None or len(self._bookings) == 0:
+        bookings = self._live_bookings()
+        if bookings is None or len(bookings) == 0:
+            return None
+        return str(bookings.done_for_today)
+
+    def _today_so_far(self) -> tuple[BookingTime, BookingTime]:
+        # arrival of the running (or next) session and the time worked before it
+        if self._bookings is None:
+            return BookingTime.create_now(), BookingTime(0, 0)
+        if self._open_since is not None:
+            return self._open_since, self._bookings.total
+        return BookingTime.create_now(), self._bookings.total
+
+    def clock_out_options(self) -> dict[str, Optional[str]]:
+        arrival, already_worked = self._today_so_far()
+        options = Planner(SETTINGS.hours_per_day).clock_out_options(
+            arrival, already_worked=already_worked, earliest_clock_out=BookingTime.create_now())
+        return {name: None if clock_out is None else str(clock_out) for name, clock_out in options.items()}
+
+    def plan_week(self, target_saldo: BookingTime, days_left: int, arrival: BookingTime) -> Optional[WeekPlan]:
+        # days_left includes today, the other days start at the given arrival time
+        if self._saldo is None or days_left < 1:
             return None
-        return str(self._bookings.done_for_today)
+        today_arrival, already_worked = self._today_so_far()
+        return Planner(SETTINGS.hours_per_day).plan_week(
+            current_saldo=self._saldo,
+            target_saldo=target_saldo,
+            arrivals=[today_arrival] + [arrival] * (days_left - 1),
+            already_worked=[already_worked],
+            earliest_clock_out=BookingTime.create_now(),
+        )
+
+    @property
+    def circuit_state(self) -> CircuitState:
+        return self._circuit_breaker.state
+
+    @property
+    def last_attempts(self) -> list[AttemptOutcome]:
+        return self._last_attempts
+
+    @property
+    def bookings(self) -> list[tuple[str, str]]:
+        bookings = self._live_bookings()
+        if bookings is None:
+            return []
+        return [(str(check_in), str(check_out)) for check_in, check_out in bookings]
+
+    def as_dict(self) -> dict:
+        return {
+            'vpn_connected': self.vpn_connected,
+            'clocked_in': self.clocked_in,
+            'saldo': self.saldo,
+            'time_today': self.time_today,
+            'done_today': self.done_today,
+            'last_check': self.last_check,
+            'bookings': self.bookings,
+            'circuit_state': self.circuit_state.value,
+            'failed_attempts': sum(not attempt.success for attempt in self.last_attempts),
+        }
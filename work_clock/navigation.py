@@ -0,0 +1,59 @@
+import re
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from work_clock.cache import JsonCache
+
+
+# the profile path of the tenant this tool was written for, used until the real one is known
+DEFAULT_PROFILE_PATH = 'iflx/profile_187001/'
+PROFILE_PATH_PATTERN = re.compile(r'iflx/profile_[^/?#]+/')
+
+
+@dataclass(frozen=True)
+class NavigationUrls:
+    base_url: str
+    profile_path: str = DEFAULT_PROFILE_PATH
+
+    @property
+    def main(self) -> str:
+        return self.base_url + self.profile_path + 'main.jsp'
+
+    @property
+    def home(self) -> str:
+        return self.base_url + self.profile_path + 'home.jsp'
+
+    @property
+    def menue(self) -> str:
+        return self.base_url + self.profile_path + 'menue.jsp'
+
+    @property
+    def booking(self) -> str:
+        return self.base_url + self.profile_path + 'bookingsmain.jsp'
+
+
+def find_profile_path(urls: Iterable[Optional[str]]) -> Optional[str]:
+    # e.g. the landing page after the login or the frames and links on it
+    for url in urls:
+        match = PROFILE_PATH_PATTERN.search(url or '')
+        if match is not None:
+            return match.group(0)
+    return None
+
+
+class NavigationCache:
+    # the profile path differs between Interflex installations, so it is remembered per base URL
+    def __init__(self, cache: Optional[JsonCache] = None):
+        self._cache = cache if cache is not None else JsonCache('navigation.json')
+
+    def lookup(self, base_url: str) -> Optional[NavigationUrls]:
+        profile_path = self._cache.load().get(base_url)
+        if profile_path is None:
+            return None
+        return NavigationUrls(base_url, profile_path)
+
+    def store(self, urls: NavigationUrls) -> None:
+        self._cache.update(lambda data: data.update({urls.base_url: urls.profile_path}))
+
+    def invalidate(self, base_url: str) -> None:
+        self._cache.update(lambda data: data.pop(base_url, None))
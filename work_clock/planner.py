@@ -0,0 +1,157 @@
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+from work_clock.time_evaluation import BookingTime, TimeBookingList, DEFAULT_BREAKS, worked_minutes
+
+
+MINUTES_PER_DAY = 24 * 60
+
+BREAK_VARIANTS: dict[str, TimeBookingList] = {
+    'default': DEFAULT_BREAKS,
+    'long lunch': [
+        (BookingTime(9, 15), BookingTime(9, 30)),
+        (BookingTime(12, 0), BookingTime(13, 0)),
+    ],
+}
+
+
+class WorkedTimeCurve:
+    # worked minutes of one day for every possible clock out minute, so that
+    # any number of candidate clock out times can be looked up in constant time
+    def __init__(self,
+                 arrival: BookingTime,
+                 break_times: TimeBookingList,
+                 already_worked: Optional[BookingTime] = None,
+                 earliest_clock_out: Optional[BookingTime] = None,
+                 ) -> None:
+        self.arrival = arrival
+        break_minutes = [(start.total_minutes, end.total_minutes) for start, end in break_times]
+        start = arrival.total_minutes
+        offset = already_worked.total_minutes if already_worked is not None else 0
+        # e.g. the current time for today, leaving earlier is not possible anymore
+        self._earliest = self.__index(max(start, earliest_clock_out.total_minutes if earliest_clock_out else 0))
+        self._curve: list[int] = [
+            offset + worked_minutes(start, max(minute, self._earliest), break_minutes)
+            for minute in range(MINUTES_PER_DAY)
+        ]
+
+    def worked_at(self, clock_out: BookingTime) -> BookingTime:
+        return BookingTime(0, self._curve[self.__index(clock_out.total_minutes)])
+
+    def worked_at_many(self, clock_outs: Sequence[int]) -> list[int]:
+        # clock out times and results are given in minutes of the day
+        return [self._curve[self.__index(minute)] for minute in clock_outs]
+
+    def clock_out_for(self, worked: BookingTime) -> Optional[BookingTime]:
+        minute = bisect_left(self._curve, worked.total_minutes)
+        if minute >= MINUTES_PER_DAY:
+            return None
+        return BookingTime(0, max(minute, self._earliest))
+
+    @staticmethod
+    def __index(minute: int) -> int:
+        return min(max(minute, 0), MINUTES_PER_DAY - 1)
+
+
+@dataclass
+class DayPlan:
+    arrival: BookingTime
+    break_variant: str
+    clock_out: BookingTime
+    worked: BookingTime
+
+
+@dataclass
+class WeekPlan:
+    days: list[DayPlan]
+    final_saldo: BookingTime
+
+    @property
+    def latest_clock_out(self) -> BookingTime:
+        return max(day.clock_out for day in self.days)
+
+
+class Planner:
+    def __init__(self,
+                 normal_hours_per_day: float,
+                 break_variants: Optional[dict[str, TimeBookingList]] = None,
+                 ) -> None:
+        self._hours_per_day = BookingTime.from_hour_float(normal_hours_per_day)
+        self._break_variants = BREAK_VARIANTS if break_variants is None else break_variants
+
+    def clock_out_options(self,
+                          arrival: BookingTime,
+                          already_worked: Optional[BookingTime] = None,
+                          target: Optional[BookingTime] = None,
+                          earliest_clock_out: Optional[BookingTime] = None,
+                          ) -> dict[str, Optional[BookingTime]]:
+        # when to leave with each break variant to reach the target (default: the normal hours)
+        target = self._hours_per_day if target is None else target
+        return {
+            name: WorkedTimeCurve(arrival, break_times, already_worked, earliest_clock_out).clock_out_for(target)
+            for name, break_times in self._break_variants.items()
+        }
+
+    def plan_week(self,
+                  current_saldo: BookingTime,
+                  target_saldo: BookingTime,
+                  arrivals: list[BookingTime],
+                  already_worked: Optional[list[BookingTime]] = None,
+                  earliest_clock_out: Optional[BookingTime] = None,
+                  ) -> Optional[WeekPlan]:
+        # the earliest clock out applies to the first day only, i.e. the current time for today
+        already_worked = already_worked or []
+        curves = [
+            {
+                name: WorkedTimeCurve(arrival, break_times, already_worked[day] if day < len(already_worked) else None,
+                                      earliest_clock_out if day == 0 else None)
+                for name, break_times in self._break_variants.items()
+            }
+            for day, arrival in enumerate(arrivals)
+        ]
+        required = (len(arrivals) * self._hours_per_day.total_minutes
+                    + target_saldo.total_minutes - current_saldo.total_minutes)
+
+        def best_at(minute: int) -> list[tuple[str, int]]:
+            # per day, the break variant that gives the most worked time when leaving at this minute
+            return [
+                max(((name, curve.worked_at(BookingTime(0, minute)).total_minutes)
+                     for name, curve in day_curves.items()),
+                    key=lambda variant: variant[1])
+                for day_curves in curves
+            ]
+
+        # the schedule with the earliest common latest clock out is found by bisecting over the day
+        low, high = 0, MINUTES_PER_DAY - 1
+        if sum(worked for _, worked in best_at(high)) < required:
+            return None
+        while low < high:
+            middle = (low + high) // 2
+            if sum(worked for _, worked in best_at(middle)) >= required:
+                high = middle
+            else:
+                low = middle + 1
+
+        # leave earlier on the last days, if everybody leaving at the latest time is too much
+        chosen = best_at(low)
+        surplus = sum(worked for _, worked in chosen) - required
+        days = [
+            DayPlan(arrival=arrival, break_variant=name, worked=BookingTime(0, worked),
+                    clock_out=day_curves[name].clock_out_for(BookingTime(0, worked)))
+            for arrival, (name, worked), day_curves in zip(arrivals, chosen, curves)
+        ]
+        for day_index in reversed(range(len(days))):
+            if surplus <= 0:
+                break
+            day = days[day_index]
+            curve = curves[day_index][day.break_variant]
+            minimum = curve.worked_at(day.arrival).total_minutes
+            reduced = max(day.worked.total_minutes - surplus, minimum)
+            surplus -= day.worked.total_minutes - reduced
+            day.worked = BookingTime(0, reduced)
+            day.clock_out = curve.clock_out_for(day.worked)
+
+        total_worked = sum(day.worked.total_minutes for day in days)
+        final_saldo = current_saldo + BookingTime(0, total_worked - len(days) * self._hours_per_day.total_minutes)
+        return WeekPlan(days=days, final_saldo=final_saldo)
@@ -0,0 +1,50 @@
+import cProfile
+import io
+import logging
+import pstats
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from work_clock.settings import config_dir_path
+
+
+# only functions from these packages are listed in the summary, the profile file contains everything
+SUMMARY_FILTER = 'work_clock|selenium'
+SUMMARY_ENTRIES = 30
+
+
+def default_profile_path() -> Path:
+    return config_dir_path().joinpath('profiles', datetime.now().strftime('refresh_%Y%m%d_%H%M%S.prof'))
+
+
+def profile_refresh(clock, cycles: int = 3, output_path: Optional[Path] = None) -> tuple[Path, str]:
+    # run full refresh cycles of the given ClockState under cProfile,
+    # returns the path of the profile file and the summary of the hotspots
+    output_path = default_profile_path() if output_path is None else Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    profiler = cProfile.Profile()
+    durations = []
+    for cycle in range(cycles):
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            # a fresh cycle every time, the result of the previous one must not be reused
+            clock.update_status(force=True)
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            logging.warning("Refresh cycle %d failed: %s", cycle + 1, repr(error))
+        finally:
+            profiler.disable()
+        durations.append(time.perf_counter() - start)
+    profiler.dump_stats(output_path)
+
+    summary = io.StringIO()
+    summary.write(f"{cycles} refresh cycles: "
+                  + ', '.join(f'{duration:.2f} s' for duration in durations) + '\n')
+    stats = pstats.Stats(profiler, stream=summary)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(SUMMARY_FILTER, SUMMARY_ENTRIES)
+    summary_text = summary.getvalue()
+    with open(output_path.with_suffix('.txt'), 'w', encoding='utf-8') as summary_file:
+        summary_file.write(summary_text)
+    return output_path, summary_text
@@ -0,0 +1,132 @@
+import atexit
+import logging
+import threading
+from collections import Counter, defaultdict
+from typing import Any, Callable
+
+from selenium.common import WebDriverException
+from urllib3.exceptions import HTTPError
+
+
+# an unreachable node fails before any WebDriver response, e.g. with urllib3's MaxRetryError
+SESSION_ERRORS = (WebDriverException, HTTPError, OSError)
+
+
+class RemoteSessionPool:
+    # browser sessions on Selenium Grid endpoints: a finished booker hands its session back for the next one,
+    # and new sessions go to the endpoint with the fewest sessions in use, so concurrent bookers are spread
+    def __init__(self, max_idle_per_endpoint: int = 1):
+        self._max_idle = max_idle_per_endpoint
+        self._lock = threading.Lock()
+        self._idle: dict[str, list[Any]] = defaultdict(list)
+        self._active: Counter = Counter()
+        self._endpoint_of: dict[int, str] = {}
+
+    def acquire(self, endpoints: list[str], connect: Callable[[str], Any]) -> Any:
+        if not endpoints:
+            raise RuntimeError("No Selenium Grid endpoint is configured")
+        while (idle := self._take_idle(endpoints)) is not None:
+            if self._alive(idle):
+                return idle
+            # e.g. the grid ended the session after its idle timeout
+            self._discard(idle)
+        error = None
+        for endpoint in self._by_load(endpoints):
+            with self._lock:
+                self._active[endpoint] += 1
+            driver = None
+            try:
+                driver = connect(endpoint)
+            except SESSION_ERRORS as connect_error:
+                logging.warning("Could not start a session on %s: %r", endpoint, connect_error)
+                error = connect_error
+            finally:
+                if driver is None:
+                    with self._lock:
+                        self._active[endpoint] -= 1
+            if driver is None:
+                continue
+            logging.info("Started a session on %s", endpoint)
+            with self._lock:
+                self._endpoint_of[id(driver)] = endpoint
+            return driver
+        raise error
+
+    def release(self, driver: Any) -> None:
+        try:
+            # the next booker might log in as somebody else and must not see this page
+            driver.delete_all_cookies()
+            driver.get('about:blank')
+        except SESSION_ERRORS:
+            self._discard(driver)
+            return
+        with self._lock:
+            endpoint = self._endpoint_of.get(id(driver))
+            if endpoint is not None:
+                self._active[endpoint] -= 1
+                if len(self._idle[endpoint]) < self._max_idle:
+                    self._idle[endpoint].append(driver)
+                    return
+                del self._endpoint_of[id(driver)]
+        self._quit(driver)
+
+    def owns(self, driver: Any) -> bool:
+        with self._lock:
+            return id(driver) in self._endpoint_of
+
+    def active(self, endpoint: str) -> int:
+        with self._lock:
+            return self._active[endpoint]
+
+    def idle(self, endpoint: str) -> int:
+        with self._lock:
+            return len(self._idle[endpoint])
+
+    def close(self) -> None:
+        with self._lock:
+            drivers = [driver for idle in self._idle.values() for driver in idle]
+            for driver in drivers:
+                del self._endpoint_of[id(driver)]
+            self._idle.clear()
+        for driver in drivers:
+            self._quit(driver)
+
+    def _take_idle(self, endpoints: list[str]) -> Any:
+        with self._lock:
+            with_idle = [endpoint for endpoint in endpoints if self._idle[endpoint]]
+            if not with_idle:
+                return None
+            endpoint = min(with_idle, key=lambda candidate: self._active[candidate])
+            self._active[endpoint] += 1
+            return self._idle[endpoint].pop()
+
+    def _by_load(self, endpoints: list[str]) -> list[str]:
+        with self._lock:
+            return sorted(endpoints, key=lambda endpoint: self._active[endpoint])
+
+    def _discard(self, driver: Any) -> None:
+        with self._lock:
+            endpoint = self._endpoint_of.pop(id(driver), None)
+            if endpoint is not None:
+                self._active[endpoint] -= 1
+        self._quit(driver)
+
+    @staticmethod
+    def _alive(driver: Any) -> bool:
+        try:
+            _ = driver.current_url
+        except SESSION_ERRORS:
+            return False
+        return True
+
+    @staticmethod
+    def _quit(driver: Any) -> None:
+        try:
+            driver.quit()
+        except SESSION_ERRORS as error:
+            logging.warning("Could not quit the remote session: %r", error)
+
+
+REMOTE_POOL = RemoteSessionPool()
+# sessions left open would occupy the grid nodes until their timeout
+atexit.register(REMOTE_POOL.close)
@@ -0,0 +1,88 @@
+import threading
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, Optional
+
+
+@dataclass
+class RetryPolicy:
+    max_attempts: int = 3
+    base_delay: float = 0.5  # in seconds
+    max_delay: float = 4.0  # in seconds
+
+    def delay(self, attempt: int) -> float:
+        # exponential backoff after the given (1-based) failed attempt
+        return min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+
+
+@dataclass
+class AttemptOutcome:
+    step: str
+    attempt: int
+    success: bool
+    duration: float  # in seconds
+    error: Optional[str] = None
+
+
+class CircuitState(Enum):
+    closed = 'closed'
+    open = 'open'
+    half_open = 'half open'
+
+
+class CircuitOpenError(RuntimeError):
+    pass
+
+
+class CircuitBreaker:
+    def __init__(self,
+                 failure_threshold: int = 3,
+                 reset_timeout: float = 300.0,
+                 clock: Callable[[], float] = time.monotonic,
+                 ) -> None:
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._clock = clock
+        self._failures: int = 0
+        self._opened_at: Optional[float] = None
+        self._trial_started_at: Optional[float] = None
+        # e.g. a refresh of the GUI and a scheduled booking check at the same time
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> CircuitState:
+        if self._opened_at is None:
+            return CircuitState.closed
+        if self._clock() - self._opened_at >= self._reset_timeout:
+            # let one trial call through, the next failure opens the circuit again
+            return CircuitState.half_open
+        return CircuitState.open
+
+    def check(self) -> None:
+        with self._lock:
+            match self.state:
+                case CircuitState.open:
+                    remaining = self._reset_timeout - (self._clock() - self._opened_at)
+                    raise CircuitOpenError(
+                        f"Interflex failed {self._failures} times in a row, next try in {remaining:.0f} seconds")
+                case CircuitState.half_open:
+                    # a trial that never reported back, does not block the circuit for longer than a reset
+                    if (self._trial_started_at is not None
+                            and self._clock() - self._trial_started_at < self._reset_timeout):
+                        raise CircuitOpenError(
+                            f"Interflex failed {self._failures} times in a row, a trial call is running")
+                    self._trial_started_at = self._clock()
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_started_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self.state == CircuitState.half_open or self._failures >= self._failure_threshold:
+                self._opened_at = self._clock()
+            self._trial_started_at = None
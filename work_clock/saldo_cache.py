@@ -0,0 +1,33 @@
+import datetime
+from typing import Optional
+
+from work_clock.cache import JsonCache
+from work_clock.time_evaluation import BookingTime
+
+
+class SaldoCache:
+    # the flexitime balance on the home page only covers the days before today,
+    # so it is valid for the rest of the calendar day it was read on
+    def __init__(self, cache: Optional[JsonCache] = None):
+        self._cache = cache if cache is not None else JsonCache('saldo_cache.json', private=True)
+
+    @staticmethod
+    def _key(base_url: str, employee_id: int) -> str:
+        return f'{base_url}#{employee_id}'
+
+    def lookup(self, base_url: str, employee_id: int,
+               day: Optional[datetime.date] = None) -> Optional[BookingTime]:
+        day = datetime.date.today() if day is None else day
+        entry = self._cache.load().get(self._key(base_url, employee_id))
+        if entry is None or entry.get('date') != day.isoformat():
+            return None
+        return BookingTime.from_string(entry['saldo'])
+
+    def store(self, base_url: str, employee_id: int, saldo: BookingTime,
+              day: Optional[datetime.date] = None) -> None:
+        day = datetime.date.today() if day is None else day
+        entry = {'date': day.isoformat(), 'saldo': str(saldo)}
+        self._cache.update(lambda data: data.update({self._key(base_url, employee_id): entry}))
+
+    def clear(self, base_url: str, employee_id: int) -> None:
+        self._cache.update(lambda data: data.pop(self._key(base_url, employee_id), None))
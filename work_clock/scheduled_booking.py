@@ -0,0 +1,71 @@
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+
+ARM_LEAD_TIME = 45.0  # in seconds, enough to launch the browser and log in
+SPIN_TIME = 0.02  # in seconds, the last moment before the target is busy waited for precision
+
+
+class ScheduledBooking:
+    # a clock in or out at a fixed moment: the session is prepared ahead of time,
+    # so that at the target only the click on the booking button is left
+    def __init__(self, target: datetime, clock_in: bool, lead_time: float = ARM_LEAD_TIME):
+        self.target = target
+        self.clock_in = clock_in
+        self.lead_time = lead_time
+        self.armed_at: Optional[datetime] = None
+        self.offset: Optional[float] = None  # in seconds, from the target to the finished click
+        self.skipped = False  # already in the wanted state at the target
+        self.error: Optional[str] = None
+        self._cancelled = threading.Event()
+        self._done = threading.Event()
+
+    @property
+    def target_timestamp(self) -> float:
+        return self.target.timestamp()
+
+    @property
+    def arm_timestamp(self) -> float:
+        return self.target_timestamp - self.lead_time
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    def finish(self) -> None:
+        self._done.set()
+
+    def wait_done(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+    def wait_until(self, timestamp: float) -> bool:
+        # sleep while the moment is far away, but stay responsive to a cancel;
+        # returns False, if the booking was cancelled in the meantime
+        while (remaining := timestamp - time.time()) > SPIN_TIME:
+            if self._cancelled.wait(remaining - SPIN_TIME):
+                return False
+        while time.time() < timestamp:
+            pass
+        return not self.cancelled
+
+    def describe(self) -> str:
+        action = "Clock in" if self.clock_in else "Clock out"
+        at = self.target.strftime('%H:%M:%S')
+        if self.error is not None:
+            return f"{action} at {at} failed: {self.error}"
+        if self.cancelled:
+            return f"{action} at {at} was cancelled"
+        if self.skipped:
+            return f"{action} at {at} was skipped, the state was already reached"
+        if self.offset is not None:
+            return f"{action} at {at} was booked {self.offset:+.2f} s from the target"
+        return f"{action} at {at} is scheduled"
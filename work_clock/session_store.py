@@ -0,0 +1,25 @@
+from typing import Optional
+
+from work_clock.cache import JsonCache
+
+
+class SessionStore:
+    def __init__(self, cache: Optional[JsonCache] = None):
+        self._cache = cache if cache is not None else JsonCache('session.json', private=True)
+
+    @staticmethod
+    def _key(base_url: str, employee_id: int) -> str:
+        return f'{base_url}#{employee_id}'
+
+    def load(self, base_url: str, employee_id: int) -> list[dict]:
+        return self._cache.load().get(self._key(base_url, employee_id), [])
+
+    def save(self, base_url: str, employee_id: int, cookies: list[dict]) -> None:
+        data = self._cache.load()
+        data[self._key(base_url, employee_id)] = cookies
+        self._cache.save(data)
+
+    def clear(self, base_url: str, employee_id: int) -> None:
+        data = self._cache.load()
+        if data.pop(self._key(base_url, employee_id), None) is not None:
+            self._cache.save(data)
@@ -11,6 +11,19 @@ class DriverType(Enum):
     edge = 'Microsoft Edge'
     firefox = 'Mozilla Firefox'
     chrome = 'Google Chrome'
+    remote = 'Selenium Grid'
+
+
+def config_dir_path() -> Path:
+    operating_system = system()
+    if operating_system == 'Windows':
+        config_dir = Path.home().joinpath(f'AppData/local/{APP_NAME_CODE}')
+    elif operating_system == 'Linux':
+        config_dir = Path.home().joinpath(f'.config/{APP_NAME_CODE}')
+    else:
+        raise RuntimeError("Unknown OS: %s" % operating_system)
+    config_dir.mkdir(parents=True, exist_ok=True)
+    return config_dir
 
 
 class UserSettings:
@@ -22,20 +35,18 @@ class UserSettings:
         self._hours_per_day: float = 7.0
         self._debug_mode: bool = False
         self._webdriver: str = DriverType.edge.value
+        self._reuse_session: bool = False
+        self._parallel_fetch: bool = False
+        self._refresh_window: float = 10.0
+        self._hedged_drivers: list[str] = []
+        self._grid_endpoints: list[str] = ['http://localhost:4444']
+        self._grid_browser: str = DriverType.chrome.value
 
         self.load()
 
     @staticmethod
     def setting_file_path() -> Path:
-        operating_system = system()
-        if operating_system == 'Windows':
-            settings_dir = Path.home().joinpath(f'AppData/local/{APP_NAME_CODE}')
-        elif operating_system == 'Linux':
-            settings_dir = Path.home().joinpath(f'.config/{APP_NAME_CODE}')
-        else:
-            raise RuntimeError("Unknown OS: %s" % operating_system)
-        settings_dir.mkdir(parents=True, exist_ok=True)
-        settings_file = settings_dir.joinpath('usersettings.json')
+        settings_file = config_dir_path().joinpath('usersettings.json')
         return settings_file
 
     def save(self):
@@ -49,6 +60,12 @@ class UserSettings:
             'hours_per_day': self._hours_per_day,
             'debug_mode': self._debug_mode,
             'webdriver': self._webdriver,
+            'reuse_session': self._reuse_session,
+            'parallel_fetch': self._parallel_fetch,
+            'refresh_window': self._refresh_window,
+            'hedged_drivers': self._hedged_drivers,
+            'grid_endpoints': self._grid_endpoints,
+            'grid_browser': self._grid_browser,
         }
         settings_json = json.dumps(settings)
         with open(self.setting_file_path(), 'w') as settings_file:
@@ -66,6 +83,12 @@ class UserSettings:
         self._hours_per_day = settings_json.get('hours_per_day', self._hours_per_day)
         self._debug_mode = settings_json.get('debug_mode', self._debug_mode)
         self._webdriver = settings_json.get('webdriver', self._webdriver)
+        self._reuse_session = settings_json.get('reuse_session', self._reuse_session)
+        self._parallel_fetch = settings_json.get('parallel_fetch', self._parallel_fetch)
+        self._refresh_window = settings_json.get('refresh_window', self._refresh_window)
+        self._hedged_drivers = settings_json.get('hedged_drivers', self._hedged_drivers)
+        self._grid_endpoints = settings_json.get('grid_endpoints', self._grid_endpoints)
+        self._grid_browser = settings_json.get('grid_browser', self._grid_browser)
 
     @property
     def base_url(self) -> str:
@@ -132,5 +155,63 @@ class UserSettings:
         self._webdriver = webdriver.value
         self.save()
 
+    @property
+    def reuse_session(self) -> bool:
+        return self._reuse_session
+
+    @reuse_session.setter
+    def reuse_session(self, reuse_session: bool) -> None:
+        self._reuse_session = reuse_session
+        self.save()
+
+    @property
+    def parallel_fetch(self) -> bool:
+        return self._parallel_fetch
+
+    @parallel_fetch.setter
+    def parallel_fetch(self, parallel_fetch: bool) -> None:
+        self._parallel_fetch = parallel_fetch
+        self.save()
+
+    @property
+    def refresh_window(self) -> float:
+        return self._refresh_window
+
+    @refresh_window.setter
+    def refresh_window(self, refresh_window: float) -> None:
+        self._refresh_window = refresh_window
+        self.save()
+
+    @property
+    def hedged_drivers(self) -> list[DriverType]:
+        # launched at the same time, the first one that is ready is used
+        return [DriverType(driver) for driver in self._hedged_drivers]
+
+    @hedged_drivers.setter
+    def hedged_drivers(self, hedged_drivers: list[DriverType]) -> None:
+        self._hedged_drivers = [driver.value for driver in hedged_drivers]
+        self.save()
+
+    @property
+    def grid_endpoints(self) -> list[str]:
+        return list(self._grid_endpoints)
+
+    @grid_endpoints.setter
+    def grid_endpoints(self, grid_endpoints: list[str]) -> None:
+        self._grid_endpoints = list(grid_endpoints)
+        self.save()
+
+    @property
+    def grid_browser(self) -> DriverType:
+        # the browser that is started on the grid nodes
+        return DriverType(self._grid_browser)
+
+    @grid_browser.setter
+    def grid_browser(self, grid_browser: DriverType) -> None:
+        if grid_browser is DriverType.remote:
+            raise ValueError("The grid needs a browser, not another grid")
+        self._grid_browser = grid_browser.value
+        self.save()
+
 
 SETTINGS = UserSettings()
@@ -0,0 +1,59 @@
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+
+@dataclass
+class _Call:
+    thread_id: int
+    done: threading.Event = field(default_factory=threading.Event)
+    result: Any = None
+    error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    # concurrent callers of the same operation join the running call instead of starting their own,
+    # and callers right after a successful call may get its result if it is still fresh enough
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._running: dict[str, _Call] = {}
+        self._finished: dict[str, tuple[float, Any]] = {}
+
+    def do(self, key: str, function: Callable[[], Any], fresh_for: float = 0.0) -> Any:
+        with self._lock:
+            call = self._running.get(key)
+            if call is None:
+                finished = self._finished.get(key)
+                if finished is not None and self._clock() - finished[0] < fresh_for:
+                    return finished[1]
+                call = _Call(thread_id=threading.get_ident())
+                self._running[key] = call
+                leader = True
+            else:
+                leader = False
+        if not leader:
+            if call.thread_id == threading.get_ident():
+                # a nested call from the running call itself would wait forever
+                return function()
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = function()
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._running[key]
+                if call.error is None:
+                    self._finished[key] = (self._clock(), call.result)
+            call.done.set()
+        return call.result
+
+    def forget(self, key: str) -> None:
+        with self._lock:
+            self._finished.pop(key, None)
@@ -1,12 +1,16 @@
 import datetime
 import functools
-from typing import Optional, Self
+from typing import Iterator, Optional, Self
 
 @functools.total_ordering
 class BookingTime:
     def __init__(self, hours: int, minutes: int):
         self._total_minutes = hours * 60 + minutes
 
+    @property
+    def total_minutes(self) -> int:
+        return self._total_minutes
+
     @property
     def negative(self) -> bool:
         return self._total_minutes < 0
@@ -63,7 +67,9 @@ class BookingTime:
     def __repr__(self) -> str:
         return f"BookingTime({self})"
 
-    def __eq__(self, other: Self) -> bool:
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, BookingTime):
+            return NotImplemented
         return self._total_minutes == other._total_minutes
 
     def __lt__(self, other: Self) -> bool:
@@ -79,6 +85,37 @@ DEFAULT_BREAKS: TimeBookingList = [
 ]
 
 
+def worked_minutes(check_in: int, check_out: int, break_times: list[tuple[int, int]]) -> int:
+    increment = check_out - check_in
+    # subtract falsely added break times
+    for break_start, break_end in break_times:
+        incl_start = check_in < break_start < check_out
+        incl_end = check_in < break_end < check_out
+        if incl_start and incl_end:
+            increment -= break_end - break_start
+        elif incl_start:
+            increment -= check_out - break_start
+        elif incl_end:
+            increment -= break_end - check_in
+    return increment
+
+
+def normalize_bookings(bookings: TimeBookingList) -> TimeBookingList:
+    # sort by check in and merge overlapping or duplicate bookings, so that no time is counted twice
+    normalized: TimeBookingList = []
+    last_out_minutes = -1
+    for check_in, check_out in sorted(bookings, key=lambda booking: booking[0].total_minutes):
+        check_in_minutes, check_out_minutes = check_in.total_minutes, check_out.total_minutes
+        if check_in_minutes < last_out_minutes:
+            if check_out_minutes > last_out_minutes:
+                normalized[-1] = (normalized[-1][0], check_out)
+                last_out_minutes = check_out_minutes
+        else:
+            normalized.append((check_in, check_out))
+            last_out_minutes = check_out_minutes
+    return normalized
+
+
 class DailyBookings:
     def __init__(self,
                  bookings: Optional[TimeBookingList] = None,
@@ -87,57 +124,89 @@ class DailyBookings:
                  ) -> None:
         if normal_hours_per_day is None:
             normal_hours_per_day = 7.0
-        self._bookings: TimeBookingList = bookings if bookings is not None else []
+        self._bookings: TimeBookingList = list(bookings) if bookings is not None else []
         self._break_times: TimeBookingList = DEFAULT_BREAKS if break_times is None else break_times
+        self._break_minutes: list[tuple[int, int]] = [
+            (break_start.total_minutes, break_end.total_minutes) for break_start, break_end in self._break_times]
         self._hours_per_day: BookingTime = BookingTime.from_hour_float(normal_hours_per_day)
+        # aggregates are computed lazily and kept until the bookings change
+        self._total: Optional[BookingTime] = None
+        self._daily_saldo: Optional[BookingTime] = None
+        self._done_for_today: Optional[BookingTime] = None
 
     def add(self, in_time: BookingTime, out_time: BookingTime) -> None:
         self._bookings.append((in_time, out_time))
+        if self._total is not None:
+            # only the new interval contributes, no need for a full rescan
+            self._total += self.__time_increment(in_time, out_time)
+        self._daily_saldo = None
+        self._done_for_today = None
 
     def add_from_string(self, in_time: str, out_time: str) -> None:
-        self._bookings.append((
-            BookingTime.from_string(in_time),
-            BookingTime.from_string(out_time),
-        ))
+        self.add(BookingTime.from_string(in_time), BookingTime.from_string(out_time))
+
+    def normalize(self) -> None:
+        self._bookings = normalize_bookings(self._bookings)
+        self._total = None
+        self._daily_saldo = None
+        self._done_for_today = None
+
+    def _replace_last(self, in_time: BookingTime, out_time: BookingTime) -> None:
+        last_in, last_out = self._bookings[-1]
+        self._bookings[-1] = (in_time, out_time)
+        if self._total is not None:
+            self._total += self.__time_increment(in_time, out_time) - self.__time_increment(last_in, last_out)
+        self._daily_saldo = None
+        self._done_for_today = None
 
     @property
     def total(self) -> BookingTime:
-        total_time = BookingTime(0, 0)
-        for check_in, check_out in self._bookings:
-            total_time += self.__time_increment(check_in, check_out)
-        return total_time
+        if self._total is None:
+            total_time = BookingTime(0, 0)
+            for check_in, check_out in self._bookings:
+                total_time += self.__time_increment(check_in, check_out)
+            self._total = total_time
+        return self._total
 
     @property
     def daily_saldo(self) -> BookingTime:
-        daily_saldo = self.total - self._hours_per_day
-        return daily_saldo
+        if self._daily_saldo is None:
+            self._daily_saldo = self.total - self._hours_per_day
+        return self._daily_saldo
 
     @property
     def done_for_today(self) -> BookingTime:
+        if self._done_for_today is None:
+            self._done_for_today = self.__compute_done_for_today()
+        return self._done_for_today
+
+    def __compute_done_for_today(self) -> BookingTime:
         partial_booking = DailyBookings(bookings=[], break_times=self._break_times)
         for check_in, check_out in self._bookings:
             partial_booking.add(check_in, check_out)
             if partial_booking.total >= self._hours_per_day:
                 break
+        last_in, last_out = partial_booking._bookings[-1]
         while partial_booking.total != self._hours_per_day:
             difference = self._hours_per_day - partial_booking.total
-            last_in, last_out = partial_booking._bookings[-1]
-            partial_booking._bookings[-1] = (last_in, last_out + difference)
-        return partial_booking._bookings[-1][1]
+            last_out += difference
+            partial_booking._replace_last(last_in, last_out)
+        return last_out
 
     def __time_increment(self, check_in: BookingTime, check_out: BookingTime) -> BookingTime:
-        increment = check_out - check_in
-        # subtract falsely added break times
-        for break_start, break_end in self._break_times:
-            incl_start = check_in < break_start < check_out
-            incl_end = check_in < break_end < check_out
-            if incl_start and incl_end:
-                increment -= break_end - break_start
-            elif incl_start:
-                increment -= check_out - break_start
-            elif incl_end:
-                increment -= break_end - check_in
-        return increment
+        minutes = worked_minutes(check_in.total_minutes, check_out.total_minutes, self._break_minutes)
+        return BookingTime(0, minutes)
+
+    @property
+    def break_times(self) -> TimeBookingList:
+        return self._break_times
+
+    @property
+    def hours_per_day(self) -> BookingTime:
+        return self._hours_per_day
 
     def __len__(self) -> int:
         return len(self._bookings)
+
+    def __iter__(self) -> Iterator[tuple[BookingTime, BookingTime]]:
+        return iter(self._bookings)
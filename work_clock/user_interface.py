@@ -1,14 +1,20 @@
 import logging
 import tkinter as tk
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
+from datetime import datetime, date, time
 from tkinter import ttk, simpledialog, messagebox
 from typing import Optional
 
+import requests
 from selenium.common import WebDriverException
 
 from work_clock import APP_NAME, APP_VERSION
+from work_clock.daemon_client import DaemonClient, RemoteClockState
+from work_clock.launch_stats import LaunchStats
+from work_clock.log_buffer import LOG_BUFFER, LOG_CAPACITY
 from work_clock.logic import ClockState
 from work_clock.settings import SETTINGS, DriverType
+from work_clock.time_evaluation import BookingTime
 
 
 @dataclass
@@ -25,20 +31,33 @@ class Symbol:
 @dataclass
 class UiLabels:
     vpn_status: str = Symbol.CHAR_UNKNOWN
-    clocked_in = Symbol.CHAR_UNKNOWN
-    time_today = Symbol.CHAR_UNKNOWN
-    clock_button = "Toggle clock status"
-    last_check = "Updated: never"
-    saldo = Symbol.CHAR_UNKNOWN
-    done_today = f"Done for today: {Symbol.CHAR_UNKNOWN}"
+    clocked_in: str = Symbol.CHAR_UNKNOWN
+    time_today: str = Symbol.CHAR_UNKNOWN
+    clock_button: str = "Toggle clock status"
+    last_check: str = "Updated: never"
+    saldo: str = Symbol.CHAR_UNKNOWN
+    done_today: str = f"Done for today: {Symbol.CHAR_UNKNOWN}"
+    schedule_button: str = "Schedule clock in/out"
 
 
 class TimeBookingUi:
     def __init__(self):
-        self._clock = ClockState()
+        daemon_client = DaemonClient()
+        if daemon_client.is_running():
+            logging.info("Using the running daemon for all requests")
+            self._clock = RemoteClockState(daemon_client)
+        else:
+            self._clock = ClockState()
         self._label = UiLabels()
+        # the widgets are created once and show these texts, so a changed text is all that is redrawn
+        self._texts: dict[str, tk.StringVar] = {}
+        self._busy = False
+        # the labels are only computed again, if an update reported a change of the status
+        self._status_changed = False
+        self._clock.subscribe(self._on_status_changes)
         self._update_labels()
         self._create_window()
+        self._schedule_tick()
 
     def _create_window(self):
         self.root = tk.Tk()
@@ -48,6 +67,7 @@ class TimeBookingUi:
         self.content = ttk.Frame(self.root, padding=10)
         self.content.grid(column=0, row=0, sticky=tk.N + tk.S + tk.E + tk.W)
 
+        self._texts = {name: tk.StringVar(master=self.root, value=text) for name, text in asdict(self._label).items()}
         self._fill_window()
 
         self.root.columnconfigure(0, weight=1)
@@ -70,15 +90,22 @@ class TimeBookingUi:
             +------+------+------+------+
         4   |                           |
             +---------------------------+
+        5   |                           |
+            +---------------------------+
+        6   |                           |
+            +---------------------------+
+        7   |                           |
+            +---------------------------+
         """
         parent = self.content
         sticky = tk.N + tk.S + tk.E + tk.W
+        text = self._texts
 
         # rows 0 + 1
         ttk.Label(parent, text="VPN Status:").grid(row=0, column=0, sticky=sticky)
         ttk.Label(parent, text="Clocked in:").grid(row=1, column=0, sticky=sticky)
-        ttk.Label(parent, text=self._label.vpn_status).grid(row=0, column=1, sticky=sticky)
-        ttk.Label(parent, text=self._label.clocked_in).grid(row=1, column=1, sticky=sticky)
+        ttk.Label(parent, textvariable=text['vpn_status']).grid(row=0, column=1, sticky=sticky)
+        ttk.Label(parent, textvariable=text['clocked_in']).grid(row=1, column=1, sticky=sticky)
         s = ttk.Style()
         s.configure('my.TButton', font=("Calibri", 20), width=4)
         ttk.Button(parent, text=Symbol.CHAR_SETTINGS, style='my.TButton', command=self._button_settings
@@ -88,58 +115,189 @@ class TimeBookingUi:
 
         # rows 2
         ttk.Label(parent, text="Time today:").grid(row=2, column=0, sticky=sticky)
-        ttk.Label(parent, text=self._label.time_today).grid(row=2, column=1, sticky=sticky)
+        ttk.Label(parent, textvariable=text['time_today']).grid(row=2, column=1, sticky=sticky)
         ttk.Label(parent, text="Saldo:").grid(row=2, column=2, sticky=sticky)
-        ttk.Label(parent, text=self._label.saldo).grid(row=2, column=3, sticky=sticky)
+        # the saldo is read once a day, clicking it reads it again
+        ttk.Button(parent, textvariable=text['saldo'], command=self._button_update_saldo
+                   ).grid(row=2, column=3, sticky=sticky)
 
         # rows 3
         ttk.Label(parent, text="Updated:").grid(row=3, column=0, sticky=sticky)
-        ttk.Label(parent, text=self._label.last_check).grid(row=3, column=1, sticky=sticky)
+        ttk.Label(parent, textvariable=text['last_check']).grid(row=3, column=1, sticky=sticky)
         ttk.Label(parent, text="Done for today:").grid(row=3, column=2, sticky=sticky)
-        ttk.Label(parent, text=self._label.done_today).grid(row=3, column=3, sticky=sticky)
+        ttk.Label(parent, textvariable=text['done_today']).grid(row=3, column=3, sticky=sticky)
 
         # row 4
-        ttk.Button(parent, text=self._label.clock_button, command=self._button_toggle_clock
+        ttk.Button(parent, textvariable=text['clock_button'], command=self._button_toggle_clock
                    ).grid(row=4, column=0, columnspan=4, sticky=sticky)
 
+        # row 5
+        ttk.Button(parent, text="Plan the week", command=self._button_plan_week
+                   ).grid(row=5, column=0, columnspan=4, sticky=sticky)
+
+        # row 6
+        ttk.Button(parent, textvariable=text['schedule_button'], command=self._button_schedule_booking
+                   ).grid(row=6, column=0, columnspan=4, sticky=sticky)
+
+        # row 7
+        ttk.Button(parent, text="Show log", command=self._button_show_log
+                   ).grid(row=7, column=0, columnspan=4, sticky=sticky)
+
         self.root.update()
 
-    def _button_update_all(self):
-        self._set_wip_labels()
-        self._fill_window()
+    def _schedule_tick(self):
+        # wake up right after the next full minute
+        self.root.after((60 - datetime.now().second) * 1000, self._tick)
+
+    def _show_labels(self) -> None:
+        # setting a variable redraws its widget, so only the changed texts are set
+        for name, label_text in asdict(self._label).items():
+            if self._texts[name].get() != label_text:
+                self._texts[name].set(label_text)
+        self.root.update()
+
+    def _redraw(self):
+        self._update_labels()
+        self._show_labels()
+
+    def _on_status_changes(self, changes: dict) -> None:
+        logging.debug("Status changed: %s", ', '.join(changes))
+        self._status_changed = True
+
+    def _show_update(self) -> None:
+        if self._status_changed:
+            self._status_changed = False
+            self._update_labels()
+        else:
+            # the same status as before, only the time of the check is new
+            self._label.last_check = self._clock.last_check
+        # restores the texts shown during the update, if nothing changed
+        self._show_labels()
+
+    def _tick(self):
+        # the time of today is extrapolated, so this needs no request to Interflex
+        if not self._busy:
+            try:
+                self._clock.poll_status()
+            except (requests.exceptions.RequestException, RuntimeError) as error:
+                logging.warning("Could not read the status: %r", error)
+            self._redraw()
+        self._schedule_tick()
+
+    def _button_update_saldo(self):
+        self._button_update_all(refresh_saldo=True)
+
+    def _button_update_all(self, refresh_saldo: bool = False):
+        self._busy = True
+        self._show_wip_labels()
         try:
-            self._clock.update_status()
-        except WebDriverException as error:
+            self._clock.update_status(refresh_saldo=refresh_saldo)
+        except (WebDriverException, RuntimeError) as error:
             logging.error(repr(error))
-        self._update_labels()
-        self._fill_window()
+        finally:
+            # otherwise the labels would stay in their work in progress state for good
+            self._busy = False
+            self._show_update()
 
     def _button_settings(self):
         dialog = SettingsUi()
 
         def update():
             dialog.root.destroy()
-            self._update_labels()
-            self._fill_window()
+            self._redraw()
 
         dialog.root.protocol("WM_DELETE_WINDOW", update)
         dialog.run()
 
+    def _button_show_log(self):
+        dialog = LogViewerUi()
+        dialog.root.protocol("WM_DELETE_WINDOW", dialog.close)
+        dialog.run()
+
     def _button_toggle_clock(self):
         confirm = messagebox.askokcancel(
             title="Clock toggle", message=f"Do you really want to '{self._label.clock_button}'?",
         )
         if not confirm:
             return
-        self._set_wip_labels()
-        self._fill_window()
+        self._busy = True
+        self._show_wip_labels()
         try:
             self._clock.toggle_clock()
             self._clock.update_status()
-        except WebDriverException as error:
+        except (WebDriverException, RuntimeError) as error:
             logging.error(repr(error))
-        self._update_labels()
-        self._fill_window()
+        finally:
+            self._busy = False
+            self._show_update()
+
+    def _button_plan_week(self):
+        target = simpledialog.askstring("Plan the week", "Which saldo do you want to reach (H:MM)?",
+                                        initialvalue="0:00")
+        if target is None:
+            return
+        days_left = simpledialog.askinteger("Plan the week", "How many work days are left, including today?",
+                                            initialvalue=max(1, 5 - datetime.today().weekday()))
+        if days_left is None:
+            return
+        arrival = simpledialog.askstring("Plan the week", "When do you start on the other days (H:MM)?",
+                                         initialvalue="8:00")
+        if arrival is None:
+            return
+        try:
+            plan = self._clock.plan_week(BookingTime.from_string(target), days_left, BookingTime.from_string(arrival))
+            options = self._clock.clock_out_options()
+        except (ValueError, IndexError, RuntimeError) as error:
+            messagebox.showerror(title="Plan the week", message=repr(error))
+            return
+        if plan is None:
+            messagebox.showinfo(title="Plan the week", message="No possible plan, please update the status first.")
+            return
+        lines = [f"Day {number}: {day.arrival} - {day.clock_out} ({day.break_variant} breaks)"
+                 for number, day in enumerate(plan.days, start=1)]
+        lines.append(f"Final saldo: {plan.final_saldo}")
+        lines.append("")
+        lines += [f"Normal hours today with {name} breaks: {clock_out or Symbol.CHAR_UNKNOWN}"
+                  for name, clock_out in options.items()]
+        messagebox.showinfo(title="Plan the week", message="\n".join(lines))
+
+    def _button_schedule_booking(self):
+        scheduled = self._clock.scheduled_booking
+        if scheduled is not None and not scheduled.done:
+            if messagebox.askokcancel(title="Scheduled booking", message=f"{scheduled.describe()}. Cancel it?"):
+                self._clock.cancel_scheduled_booking()
+            return
+        if self._clock.clocked_in is None:
+            messagebox.showinfo(title="Scheduled booking", message="Please update the status first.")
+            return
+        clock_in = not self._clock.clocked_in
+        action = "clock in" if clock_in else "clock out"
+        initial_value = (self._clock.done_today if not clock_in else None) or str(BookingTime.create_now())
+        target = simpledialog.askstring("Scheduled booking", f"When do you want to {action} (H:MM)?",
+                                        initialvalue=initial_value)
+        if target is None:
+            return
+        try:
+            target_time = BookingTime.from_string(target)
+            target_datetime = datetime.combine(date.today(), time(target_time.hours, target_time.minutes))
+            self._clock.schedule_booking(target_datetime, clock_in=clock_in)
+        except (ValueError, IndexError, RuntimeError) as error:
+            messagebox.showerror(title="Scheduled booking", message=repr(error))
+            return
+        self._redraw()
+        self._watch_scheduled_booking()
+
+    def _watch_scheduled_booking(self):
+        # report the achieved offset, as soon as the scheduled booking is done
+        scheduled = self._clock.scheduled_booking
+        if scheduled is None:
+            return
+        if not scheduled.done:
+            self.root.after(1000, self._watch_scheduled_booking)
+            return
+        if not scheduled.cancelled:
+            messagebox.showinfo(title="Scheduled booking", message=scheduled.describe())
+        self._button_update_all()
 
     def _update_labels(self) -> None:
         def none_to_unknown(x: Optional[str]) -> str:
@@ -163,11 +321,69 @@ class TimeBookingUi:
             case True: self._label.clock_button = "Clock out"
             case False: self._label.clock_button = "Clock in"
 
-    def _set_wip_labels(self) -> None:
-        self._label.clocked_in = Symbol.CHAR_ELLIPSES
-        self._label.time_today = Symbol.CHAR_ELLIPSES
-        self._label.last_check = Symbol.CHAR_ELLIPSES
-        self._label.clock_button = Symbol.CHAR_ELLIPSES
+        scheduled = self._clock.scheduled_booking
+        if scheduled is not None and not scheduled.done:
+            self._label.schedule_button = scheduled.describe()
+        else:
+            self._label.schedule_button = "Schedule clock in/out"
+
+    def _show_wip_labels(self) -> None:
+        # only shown, the labels keep their texts for the end of the update
+        for name in ('clocked_in', 'time_today', 'last_check', 'clock_button'):
+            self._texts[name].set(Symbol.CHAR_ELLIPSES)
+        self.root.update()
+
+    def run(self):
+        self.root.mainloop()
+
+
+class LogViewerUi:
+    REFRESH_INTERVAL = 1000  # in milliseconds
+
+    def __init__(self):
+        self._sequence = 0
+        self._after_id: Optional[str] = None
+        self._create_window()
+        self._append_new_lines()
+
+    def _create_window(self):
+        self.root = tk.Tk()
+        self.root.winfo_toplevel().title(APP_NAME + " Log")
+
+        self.content = ttk.Frame(self.root, padding=10)
+        self.content.grid(column=0, row=0, sticky=tk.N + tk.S + tk.E + tk.W)
+
+        self.text = tk.Text(self.content, width=140, height=35, wrap=tk.NONE, state=tk.DISABLED)
+        scrollbar = ttk.Scrollbar(self.content, orient=tk.VERTICAL, command=self.text.yview)
+        self.text.configure(yscrollcommand=scrollbar.set)
+        self.text.grid(row=0, column=0, sticky=tk.N + tk.S + tk.E + tk.W)
+        scrollbar.grid(row=0, column=1, sticky=tk.N + tk.S)
+
+        self.root.columnconfigure(0, weight=1)
+        self.root.rowconfigure(0, weight=1)
+        self.content.columnconfigure(0, weight=1)
+        self.content.rowconfigure(0, weight=1)
+
+    def _append_new_lines(self):
+        # only the records since the last refresh are formatted
+        self._sequence, lines = LOG_BUFFER.lines_since(self._sequence)
+        if lines:
+            follow = self.text.yview()[1] >= 1.0
+            self.text.configure(state=tk.NORMAL)
+            self.text.insert(tk.END, '\n'.join(lines) + '\n')
+            # show no more lines than the buffer holds
+            excess = int(self.text.index('end-1c').split('.')[0]) - 1 - LOG_CAPACITY
+            if excess > 0:
+                self.text.delete('1.0', f'{excess + 1}.0')
+            self.text.configure(state=tk.DISABLED)
+            if follow:
+                self.text.see(tk.END)
+        self._after_id = self.root.after(self.REFRESH_INTERVAL, self._append_new_lines)
+
+    def close(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+        self.root.destroy()
 
     def run(self):
         self.root.mainloop()
@@ -179,9 +395,16 @@ class UiLabelsSettings:
     employee_id: str = ""
     employee_pin: str = ""
     hours_per_day: str = ""
+    refresh_window: str = ""
     today_in_saldo: str = ""
     debug_mode: str = ""
+    reuse_session: str = ""
+    parallel_fetch: str = ""
+    hedged_drivers: str = ""
+    fastest_driver: str = ""
+    grid_endpoints: str = ""
     webdriver: Optional[tk.StringVar] = None
+    grid_browser: Optional[tk.StringVar] = None
 
 
 class SettingsUi:
@@ -200,6 +423,7 @@ class SettingsUi:
         self.content.grid(column=0, row=0, sticky=tk.N + tk.S + tk.E + tk.W)
 
         self._label.webdriver = tk.StringVar(master=self.root, value=SETTINGS.webdriver.value)
+        self._label.grid_browser = tk.StringVar(master=self.root, value=SETTINGS.grid_browser.value)
 
         self._fill_window()
 
@@ -222,11 +446,24 @@ class SettingsUi:
         self._label.employee_pin = Symbol.CHAR_BULLET * len(str(SETTINGS.employee_pin))
 
         self._label.hours_per_day = str(SETTINGS.hours_per_day)
+        self._label.refresh_window = str(SETTINGS.refresh_window)
 
         self._label.today_in_saldo = bool_label(SETTINGS.today_in_saldo)
         self._label.debug_mode = bool_label(SETTINGS.debug_mode)
+        self._label.reuse_session = bool_label(SETTINGS.reuse_session)
+        self._label.parallel_fetch = bool_label(SETTINGS.parallel_fetch)
+        self._label.hedged_drivers = ', '.join(driver.name for driver in SETTINGS.hedged_drivers) or Symbol.CHAR_NO
+        launch_stats = LaunchStats()
+        fastest = launch_stats.preferred()
+        if fastest is None:
+            self._label.fastest_driver = Symbol.CHAR_UNKNOWN
+        else:
+            self._label.fastest_driver = f"{fastest.name} ({launch_stats.latency(fastest).average_seconds:.1f} s)"
+        self._label.grid_endpoints = ', '.join(SETTINGS.grid_endpoints) or Symbol.CHAR_UNKNOWN
         if not self._label.webdriver is None:
             self._label.webdriver.set(SETTINGS.webdriver.value)
+        if not self._label.grid_browser is None:
+            self._label.grid_browser.set(SETTINGS.grid_browser.value)
 
     def _fill_window(self):
         parent = self.content
@@ -253,6 +490,11 @@ class SettingsUi:
         ttk.Button(parent, text=self._label.hours_per_day, command=self._button_set_hours_per_day
                    ).grid(row=row, column=1, sticky=sticky)
 
+        row += 1
+        ttk.Label(parent, text="Reuse updates for (seconds):").grid(row=row, column=0, sticky=sticky)
+        ttk.Button(parent, text=self._label.refresh_window, command=self._button_set_refresh_window
+                   ).grid(row=row, column=1, sticky=sticky)
+
         row += 1
         ttk.Label(parent, text="Include today in saldo?").grid(row=row, column=0, sticky=sticky)
         ttk.Button(parent, text=self._label.today_in_saldo, command=self._button_today_in_saldo
@@ -263,6 +505,25 @@ class SettingsUi:
         ttk.Button(parent, text=self._label.debug_mode, command=self._button_set_debug_mode
                    ).grid(row=row, column=1, sticky=sticky)
 
+        row += 1
+        ttk.Label(parent, text="Keep session between runs?").grid(row=row, column=0, sticky=sticky)
+        ttk.Button(parent, text=self._label.reuse_session, command=self._button_reuse_session
+                   ).grid(row=row, column=1, sticky=sticky)
+
+        row += 1
+        ttk.Label(parent, text="Load pages in parallel?").grid(row=row, column=0, sticky=sticky)
+        ttk.Button(parent, text=self._label.parallel_fetch, command=self._button_parallel_fetch
+                   ).grid(row=row, column=1, sticky=sticky)
+
+        row += 1
+        ttk.Label(parent, text="Launch browsers at once:").grid(row=row, column=0, sticky=sticky)
+        ttk.Button(parent, text=self._label.hedged_drivers, command=self._button_set_hedged_drivers
+                   ).grid(row=row, column=1, sticky=sticky)
+
+        row += 1
+        ttk.Label(parent, text="Fastest browser here:").grid(row=row, column=0, sticky=sticky)
+        ttk.Label(parent, text=self._label.fastest_driver).grid(row=row, column=1, sticky=sticky)
+
         row += 1
         ttk.Label(parent, text="Web Driver:").grid(row=row, column=0, sticky=sticky)
         driver_options = ttk.Combobox(parent, textvariable=self._label.webdriver)
@@ -270,6 +531,18 @@ class SettingsUi:
         driver_options.grid(row=row, column=1, sticky=sticky)
         driver_options['values'] = [driver.value for driver in DriverType]
 
+        row += 1
+        ttk.Label(parent, text="Selenium Grid endpoints:").grid(row=row, column=0, sticky=sticky)
+        ttk.Button(parent, text=self._label.grid_endpoints, command=self._button_set_grid_endpoints
+                   ).grid(row=row, column=1, sticky=sticky)
+
+        row += 1
+        ttk.Label(parent, text="Browser on the grid:").grid(row=row, column=0, sticky=sticky)
+        grid_browser_options = ttk.Combobox(parent, textvariable=self._label.grid_browser)
+        grid_browser_options.bind(sequence='<<ComboboxSelected>>', func=self._combo_set_grid_browser)
+        grid_browser_options.grid(row=row, column=1, sticky=sticky)
+        grid_browser_options['values'] = [driver.value for driver in DriverType if driver is not DriverType.remote]
+
         self.root.update()
 
     def _button_set_base_url(self):
@@ -304,6 +577,14 @@ class SettingsUi:
         self._update_labels()
         self._fill_window()
 
+    def _button_set_refresh_window(self):
+        result = simpledialog.askfloat("User input", "For how many seconds can an update answer another one?",
+                                       initialvalue=SETTINGS.refresh_window, minvalue=0.0)
+        if result is not None:
+            SETTINGS.refresh_window = result
+        self._update_labels()
+        self._fill_window()
+
     def _button_today_in_saldo(self):
         match SETTINGS.today_in_saldo:
             case True: SETTINGS.today_in_saldo = False
@@ -318,6 +599,48 @@ class SettingsUi:
         self._update_labels()
         self._fill_window()
 
+    def _button_reuse_session(self):
+        match SETTINGS.reuse_session:
+            case True: SETTINGS.reuse_session = False
+            case False: SETTINGS.reuse_session = True
+        self._update_labels()
+        self._fill_window()
+
+    def _button_parallel_fetch(self):
+        match SETTINGS.parallel_fetch:
+            case True: SETTINGS.parallel_fetch = False
+            case False: SETTINGS.parallel_fetch = True
+        self._update_labels()
+        self._fill_window()
+
+    def _button_set_hedged_drivers(self):
+        names = ', '.join(driver.name for driver in DriverType)
+        result = simpledialog.askstring(
+            "User input", f"Which browsers should be launched at once, the first one ready is used?\n"
+                          f"Choose from {names}, leave empty to only use the Web Driver.",
+            initialvalue=', '.join(driver.name for driver in SETTINGS.hedged_drivers))
+        if result is not None:
+            try:
+                SETTINGS.hedged_drivers = [DriverType[name.strip()] for name in result.split(',') if name.strip()]
+            except KeyError as error:
+                messagebox.showerror(title="Launch browsers at once", message=f"Unknown browser {error}")
+        self._update_labels()
+        self._fill_window()
+
+    def _button_set_grid_endpoints(self):
+        result = simpledialog.askstring(
+            "User input", "Under which URLs are the Selenium Grid hubs or nodes reachable (comma separated)?",
+            initialvalue=', '.join(SETTINGS.grid_endpoints))
+        if result is not None:
+            SETTINGS.grid_endpoints = [endpoint.strip() for endpoint in result.split(',') if endpoint.strip()]
+        self._update_labels()
+        self._fill_window()
+
+    def _combo_set_grid_browser(self, event):
+        SETTINGS.grid_browser = DriverType(self._label.grid_browser.get())
+        self._update_labels()
+        self._fill_window()
+
     def _combo_set_driver(self, event):
         SETTINGS.webdriver = DriverType(self._label.webdriver.get())
         self._update_labels()